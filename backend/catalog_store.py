@@ -0,0 +1,434 @@
+"""
+The in-memory assessment catalog: validated, frozen entries with their
+pre-encoded payloads and scorers, immutable snapshots of them, and the
+cache that keeps the served snapshot in sync with MongoDB.
+"""
+
+import asyncio
+import hashlib
+import importlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple, Union
+
+from database import MongoManager
+from payloads import EncodedPayload, encode_json
+from schema import ASSESSMENT_SCHEMA, SUMMARY_SCHEMA
+from scoring import SummedScorer, TypologyScorer, compile_scorer
+
+logger = logging.getLogger(__name__)
+
+class FrozenDict(dict):
+    """A dict that refuses mutation but still takes FastAPI's fast dict encoding path"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("The assessment catalog is read-only")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+def _freeze(value):
+    """Recursively convert catalog literals into read-only dicts and tuples"""
+    if isinstance(value, dict):
+        return FrozenDict({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def _validate_assessment(assessment_id: str, detail: dict) -> None:
+    if detail.get("id") != assessment_id:
+        raise ValueError(f"Assessment {assessment_id!r} is stored with id {detail.get('id')!r}")
+    questions = detail.get("questions") or []
+    if not questions:
+        raise ValueError(f"Assessment {assessment_id!r} has no questions")
+    for position, question in enumerate(questions, start=1):
+        if question.get("id") != position:
+            raise ValueError(f"Assessment {assessment_id!r} question {position} has id {question.get('id')!r}")
+        values = [option["value"] for option in question.get("options", [])]
+        if len(values) < 2 or len(set(values)) != len(values):
+            raise ValueError(f"Assessment {assessment_id!r} question {position} needs two or more distinct option values")
+    if "interpretation" not in detail and "types" not in detail:
+        raise ValueError(f"Assessment {assessment_id!r} has neither interpretation nor types")
+
+def _parse_band_label(assessment_id: str, label: str) -> Tuple[int, int]:
+    low, separator, high = label.partition("-")
+    try:
+        if not separator:
+            raise ValueError
+        return int(low), int(high)
+    except ValueError:
+        raise ValueError(f"Assessment {assessment_id!r} has malformed interpretation range {label!r}") from None
+
+def _numeric_bands(assessment_id: str, interpretation: Mapping) -> dict:
+    bands = {}
+    for label, band in interpretation.items():
+        low, high = _parse_band_label(assessment_id, label)
+        bands[label] = {**band, "min": low, "max": high}
+    return bands
+
+def _with_numeric_bands(assessment_id: str, detail: dict) -> dict:
+    """Add numeric min/max to each interpretation band so clients never parse "10-14" labels"""
+    if "interpretation" not in detail:
+        return detail
+    detail = {**detail, "interpretation": _numeric_bands(assessment_id, detail["interpretation"])}
+    if "subscales" in detail:
+        detail["subscales"] = {
+            key: {**subscale, "interpretation": _numeric_bands(assessment_id, subscale.get("interpretation") or {})}
+            for key, subscale in detail["subscales"].items()
+        }
+    return detail
+
+# Every distinct option scale, keyed by its JSON encoding; questions (across all assessments) share these tuples
+_OPTION_SCALES: Dict[bytes, tuple] = {}
+
+def _intern_option_scales(detail: FrozenDict) -> FrozenDict:
+    """Point every question at the one shared tuple for its option scale"""
+    questions = tuple(
+        FrozenDict({**question, "options": _OPTION_SCALES.setdefault(encode_json(question["options"]), question["options"])})
+        for question in detail["questions"]
+    )
+    return FrozenDict({**detail, "questions": questions})
+
+def _prune_option_scales(entries: Iterable["CatalogEntry"]) -> None:
+    """Forget scales no served entry uses, so edits and rejected documents do not accumulate.
+
+    Dropping one is always safe: _compact_detail only needs equal scales to be
+    the same object within one detail, and each detail keeps its own tuples.
+    """
+    used = {id(question["options"]) for entry in entries for question in entry.detail["questions"]}
+    for key in [key for key, options in _OPTION_SCALES.items() if id(options) not in used]:
+        del _OPTION_SCALES[key]
+
+def _compact_detail(detail: Mapping) -> dict:
+    """The ?format=compact body: each option scale sent once, questions refer to it by index.
+
+    Relies on _intern_option_scales, so equal scales are the same object.
+    """
+    scale_index: Dict[int, int] = {}
+    scales = []
+    questions = []
+    for question in detail["questions"]:
+        options = question["options"]
+        index = scale_index.setdefault(id(options), len(scales))
+        if index == len(scales):
+            scales.append(options)
+        compact_question = {key: value for key, value in question.items() if key != "options"}
+        compact_question["scale"] = index
+        questions.append(compact_question)
+
+    compact = {}
+    for key, value in detail.items():
+        if key == "questions":
+            compact["scales"] = scales
+            value = questions
+        compact[key] = value
+    return compact
+
+def _result_payloads(scorer) -> Tuple[EncodedPayload, ...]:
+    """One pre-encoded result per possible score, indexed by score - min_score; empty for typologies.
+
+    The bodies are a few hundred bytes, below what is worth compressing, so
+    they are encoded without variants and the whole table costs a few ms.
+    """
+    if not isinstance(scorer, SummedScorer):
+        return ()
+    payloads = []
+    for score in range(scorer.bands.min_score, scorer.max_score + 1):
+        body = encode_json(scorer.result(score))
+        payloads.append(EncodedPayload(identity=body, variants={}, digest=hashlib.sha256(body).hexdigest()[:32]))
+    return tuple(payloads)
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """One validated instrument and everything precomputed from it"""
+    position: int
+    summary: Mapping
+    detail: Mapping
+    payload: EncodedPayload
+    compact_payload: EncodedPayload
+    scorer: Union[SummedScorer, TypologyScorer]
+    result_payloads: Tuple[EncodedPayload, ...]
+
+    @classmethod
+    def build(
+        cls, position: int, summary: Mapping, detail: Mapping, brotli_quality: Optional[int] = 11
+    ) -> "CatalogEntry":
+        assessment_id = summary.get("id")
+        SUMMARY_SCHEMA.validate_python(summary, strict=True)
+        _validate_assessment(assessment_id, detail)
+        detail = _with_numeric_bands(assessment_id, detail)
+        # Strict, since the raw detail is what gets served and scored: lax mode would pass 2.0 or "2"
+        # as an option value and leave the scorer to fail on it. Schema errors are pydantic
+        # ValidationErrors, i.e. ValueErrors, like the checks above.
+        ASSESSMENT_SCHEMA.validate_python(detail, strict=True)
+        detail = _intern_option_scales(_freeze(detail))
+        # Compiling the scorer also checks the bands tile the score range and MBTI types are complete
+        scorer = compile_scorer(detail)
+        return cls(
+            position=position,
+            summary=_freeze(summary),
+            detail=detail,
+            payload=EncodedPayload.from_content(detail, brotli_quality),
+            compact_payload=EncodedPayload.from_content(_compact_detail(detail), brotli_quality),
+            scorer=scorer,
+            result_payloads=_result_payloads(scorer),
+        )
+
+    @classmethod
+    def from_document(cls, document: Mapping) -> "CatalogEntry":
+        summary = document.get("summary") or {}
+        if summary.get("id") != document.get("_id"):
+            raise ValueError(f"Catalog document {document.get('_id')!r} has summary id {summary.get('id')!r}")
+        return cls.build(document.get("position", 0), summary, document.get("detail") or {})
+
+# Bundles are built on first request, so brotli runs at a quick quality (11 would take ~150ms for all)
+BUNDLE_BROTLI_QUALITY = 5
+BUNDLE_CACHE_SIZE = int(os.environ.get('BUNDLE_CACHE_SIZE', '64'))
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """One immutable version of the catalog; updates build a new snapshot and swap it in"""
+    entries: Mapping[str, CatalogEntry]
+    list_payload: EncodedPayload
+    ids: FrozenSet[str]
+    # LRU of bundle payloads keyed by (ids, format); dropped with the snapshot, so never stale
+    _bundles: "OrderedDict[Tuple[Tuple[str, ...], str], EncodedPayload]" = field(
+        default_factory=OrderedDict, compare=False, repr=False
+    )
+
+    @classmethod
+    def from_entries(cls, entries: Dict[str, CatalogEntry]) -> "CatalogSnapshot":
+        ordered = dict(sorted(entries.items(), key=lambda item: (item[1].position, item[0])))
+        return cls(
+            entries=MappingProxyType(ordered),
+            list_payload=EncodedPayload.from_content([entry.summary for entry in ordered.values()]),
+            ids=frozenset(ordered),
+        )
+
+    def bundle(self, ids: Tuple[str, ...], format: str = "full") -> EncodedPayload:
+        """The list plus the given details as one body, spliced from the pre-encoded bytes.
+
+        ids must be known and in catalog order, so equal requests share a cache slot and an ETag.
+        """
+        key = (ids, format)
+        payload = self._bundles.get(key)
+        if payload is not None:
+            self._bundles.move_to_end(key)
+            return payload
+
+        details = []
+        for assessment_id in ids:
+            entry = self.entries[assessment_id]
+            detail_payload = entry.compact_payload if format == "compact" else entry.payload
+            details.append(encode_json(assessment_id) + b":" + detail_payload.identity)
+        body = b'{"assessments":' + self.list_payload.identity + b',"details":{' + b",".join(details) + b"}}"
+        payload = EncodedPayload.from_body(body, brotli_quality=BUNDLE_BROTLI_QUALITY)
+
+        self._bundles[key] = payload
+        if len(self._bundles) > BUNDLE_CACHE_SIZE:
+            self._bundles.popitem(last=False)
+        return payload
+
+    def add_brotli(self) -> None:
+        """Compress the br variants build_catalog deferred; runs in a worker thread while the snapshot is served"""
+        for entry in self.entries.values():
+            entry.payload.add_brotli()
+            entry.compact_payload.add_brotli()
+        self.list_payload.add_brotli()
+
+    def updated(self, changed: Dict[str, CatalogEntry], removed: Iterable[str]) -> "CatalogSnapshot":
+        """A new snapshot reusing every entry that did not change"""
+        entries = dict(self.entries)
+        entries.update(changed)
+        for assessment_id in removed:
+            entries.pop(assessment_id, None)
+        return CatalogSnapshot.from_entries(entries)
+
+def build_catalog(summaries: List[dict], details: Dict[str, dict]) -> CatalogSnapshot:
+    """Validate the built-in catalog literals and precompute every response and scorer.
+
+    Brotli at quality 11 is ~90% of the build, so the detail payloads start out
+    with gzip only and CatalogCache.compress() adds br once the app is serving.
+    """
+    summary_ids = [summary["id"] for summary in summaries]
+    if len(set(summary_ids)) != len(summary_ids):
+        raise ValueError("Duplicate assessment ids in the assessment list")
+    if set(summary_ids) != set(details):
+        raise ValueError(f"Assessment list and details disagree: {sorted(set(summary_ids) ^ set(details))}")
+    return CatalogSnapshot.from_entries({
+        summary["id"]: CatalogEntry.build(position, summary, details[summary["id"]], brotli_quality=None)
+        for position, summary in enumerate(summaries)
+    })
+
+CATALOG_COLLECTION = os.environ.get('CATALOG_COLLECTION', 'assessments')
+CATALOG_POLL_SECONDS = float(os.environ.get('CATALOG_POLL_SECONDS', '60'))
+# "The $changeStream stage is only supported on replica sets"
+_CHANGE_STREAMS_UNSUPPORTED = 40573
+
+class CatalogCache:
+    """Serves the catalog from memory and keeps it in sync with MongoDB in the background.
+
+    Request handlers only read ``snapshot``; Mongo is never on the request
+    path. Edits to the catalog collection arrive through a change stream, or
+    by polling every CATALOG_POLL_SECONDS where change streams are not
+    available (standalone mongod). Only the changed instruments are rebuilt,
+    and an edit that fails validation is logged and skipped so the last good
+    version keeps being served.
+    """
+
+    def __init__(self, snapshot: CatalogSnapshot, documents: List[dict]):
+        self.snapshot = snapshot
+        # Inserted by seed() when the collection is empty
+        self._seed = list(documents)
+        # The documents the current snapshot was built from, and edits that failed validation
+        self._documents: Dict[str, dict] = {document["_id"]: document for document in documents}
+        self._rejected: Dict[str, dict] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._compress_task: Optional[asyncio.Task] = None
+
+    def start(self, mongo: MongoManager) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(mongo))
+
+    def compress(self) -> None:
+        """Add the brotli variants build_catalog deferred, off the event loop"""
+        if self._compress_task is None:
+            self._compress_task = asyncio.create_task(self._compress())
+
+    async def _compress(self) -> None:
+        started = time.perf_counter()
+        # Entries rebuilt from MongoDB meanwhile already have br; the shared ones get it here
+        await asyncio.to_thread(self.snapshot.add_brotli)
+        logger.info("Catalog brotli variants ready after %.0fms", (time.perf_counter() - started) * 1000)
+
+    async def stop(self) -> None:
+        if self._compress_task is not None:
+            # A worker thread cannot be interrupted; it is short, so let it finish
+            await self._compress_task
+            self._compress_task = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                # Already logged by _run's guard; shutdown must go on to flush and close
+                logger.exception("Catalog sync task had failed")
+            self._task = None
+
+    async def seed(self, collection) -> None:
+        """Fill an empty collection from the built-in catalog"""
+        from pymongo.errors import BulkWriteError
+
+        if await collection.count_documents({}, limit=1):
+            return
+        try:
+            await collection.insert_many(self._seed, ordered=False)
+            logger.info("Seeded %s with the built-in catalog", CATALOG_COLLECTION)
+        except BulkWriteError:
+            pass  # another worker seeded it first
+
+    async def reload(self, collection) -> None:
+        """Read the whole collection and rebuild whatever differs from what is served"""
+        documents = {document["_id"]: document async for document in collection.find()}
+        if not documents:
+            logger.warning("Catalog collection %s is empty; keeping the current catalog", CATALOG_COLLECTION)
+            return
+        changed = {
+            assessment_id: document for assessment_id, document in documents.items()
+            if document != self._documents.get(assessment_id) and document != self._rejected.get(assessment_id)
+        }
+        await self.apply(changed, set(self.snapshot.entries) - set(documents))
+
+    @staticmethod
+    def _build_entries(documents: Dict[str, dict]) -> Tuple[Dict[str, CatalogEntry], Dict[str, Exception]]:
+        """Build entries for changed documents, and the error of each that failed; runs in a worker thread"""
+        built, failed = {}, {}
+        for assessment_id, document in documents.items():
+            try:
+                built[assessment_id] = CatalogEntry.from_document(document)
+            except Exception as exc:
+                # Whatever a bad edit trips over, only that document is skipped
+                failed[assessment_id] = exc
+        return built, failed
+
+    async def apply(self, documents: Dict[str, dict], removed: Iterable[str] = ()) -> None:
+        # Compressing the payloads and compiling the scorer takes ~30ms per entry, so it runs off
+        # the event loop; requests keep being served from the current snapshot meanwhile
+        built, failed = await asyncio.to_thread(self._build_entries, documents) if documents else ({}, {})
+        changed = {}
+        for assessment_id, document in documents.items():
+            if assessment_id in failed:
+                logger.error("Ignoring invalid catalog document %r: %s", assessment_id, failed[assessment_id])
+                self._rejected[assessment_id] = document
+                continue
+            changed[assessment_id] = built[assessment_id]
+            self._documents[assessment_id] = document
+            self._rejected.pop(assessment_id, None)
+        removed = [assessment_id for assessment_id in removed if assessment_id in self.snapshot.entries]
+        for assessment_id in removed:
+            self._documents.pop(assessment_id, None)
+        if changed or removed:
+            self.snapshot = self.snapshot.updated(changed, removed)
+            logger.info("Catalog updated: %s changed, %s removed", sorted(changed), sorted(removed))
+        if documents:
+            _prune_option_scales(self.snapshot.entries.values())
+
+    async def _watch(self, collection) -> None:
+        async with collection.watch(full_document="updateLookup") as stream:
+            # Pick up anything that changed before the stream was open
+            await self.reload(collection)
+            async for change in stream:
+                operation = change["operationType"]
+                if operation in ("insert", "update", "replace"):
+                    document = change.get("fullDocument")
+                    if document is not None:
+                        await self.apply({document["_id"]: document})
+                elif operation == "delete":
+                    await self.apply({}, [change["documentKey"]["_id"]])
+                else:
+                    return  # drop/rename/invalidate: reopen after the poll interval
+
+    async def _run(self, mongo: MongoManager) -> None:
+        started = time.perf_counter()
+        # Import the driver off the event loop; the imports below are then dictionary lookups
+        await asyncio.to_thread(importlib.import_module, "motor.motor_asyncio")
+        from pymongo.errors import OperationFailure, PyMongoError
+        imported = time.perf_counter()
+
+        use_change_stream = True
+        seeded = False
+        collection = None
+        while True:
+            try:
+                if collection is None:
+                    collection = (await mongo.get_database())[CATALOG_COLLECTION]
+                if not seeded:
+                    await self.seed(collection)
+                    seeded = True
+                    logger.info(
+                        "Catalog sync connected to MongoDB after %.0fms (driver import %.0fms)",
+                        (time.perf_counter() - started) * 1000, (imported - started) * 1000,
+                    )
+                if use_change_stream:
+                    await self._watch(collection)
+                else:
+                    await self.reload(collection)
+            except OperationFailure as exc:
+                if exc.code == _CHANGE_STREAMS_UNSUPPORTED:
+                    logger.info("Change streams unavailable; polling the catalog every %ss", CATALOG_POLL_SECONDS)
+                    use_change_stream = False
+                    continue
+                logger.warning("Catalog sync failed: %s", exc)
+            except PyMongoError as exc:
+                logger.warning("Catalog sync failed: %s", exc)
+            except Exception:
+                # A bug must not end syncing for the life of the process; retry after the interval
+                logger.exception("Catalog sync failed unexpectedly")
+            await asyncio.sleep(CATALOG_POLL_SECONDS)
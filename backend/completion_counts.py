@@ -0,0 +1,150 @@
+"""
+Anonymous completion counters, buffered per thread and flushed to MongoDB in bulk.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from database import MongoManager
+
+logger = logging.getLogger(__name__)
+
+COMPLETION_COLLECTION = os.environ.get('COMPLETION_COLLECTION', 'completion_counts')
+COMPLETION_FLUSH_SECONDS = float(os.environ.get('COMPLETION_FLUSH_SECONDS', '30'))
+# Bounds the final flush so a dead database cannot hold up shutdown
+COMPLETION_SHUTDOWN_TIMEOUT = 5.0
+
+CompletionKey = Tuple[int, str, str]  # (days since epoch, assessment id, band level or type)
+
+class _CounterShard:
+    """Counts written by exactly one thread; the flusher only swaps the dicts"""
+    __slots__ = ("active", "retired")
+
+    def __init__(self):
+        self.active: Dict[CompletionKey, int] = {}
+        self.retired: Dict[CompletionKey, int] = {}
+
+class CompletionCounters:
+    """Anonymous completion counts per day, assessment and result band - nothing about the person.
+
+    Recording never touches the database or a lock: each thread (the event
+    loop, and the threadpool that streams batch results) increments its own
+    shard. Every COMPLETION_FLUSH_SECONDS the flusher retires each shard's
+    active dict and sends the one it retired on the previous round, by
+    which time any increment that raced the swap has landed, as $inc
+    upserts in a single bulk_write. Pending counts are flushed on shutdown.
+    """
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self._local = threading.local()
+        self._shards: List[_CounterShard] = []
+        self._unsent: Dict[CompletionKey, int] = {}  # flusher-only: counts whose write failed
+        self._task: Optional[asyncio.Task] = None
+
+    def _shard(self) -> _CounterShard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _CounterShard()
+            self._shards.append(shard)
+        return shard
+
+    def record(self, assessment_id: str, band: str, count: int = 1) -> None:
+        if not self.enabled:
+            return
+        counts = self._shard().active
+        key = (int(time.time() // 86400), assessment_id, band)
+        counts[key] = counts.get(key, 0) + count
+
+    def record_many(self, assessment_id: str, band_counts: Mapping[str, int]) -> None:
+        if not self.enabled:
+            return
+        counts = self._shard().active
+        day = int(time.time() // 86400)
+        for band, count in band_counts.items():
+            key = (day, assessment_id, band)
+            counts[key] = counts.get(key, 0) + count
+
+    def _collect(self, final: bool = False) -> Dict[CompletionKey, int]:
+        totals, self._unsent = self._unsent, {}
+        for shard in list(self._shards):
+            ready = [shard.retired]
+            if final:
+                ready.append(shard.active)
+                shard.retired, shard.active = {}, {}
+            else:
+                shard.retired = shard.active
+                shard.active = {}
+            for counts in ready:
+                for key, count in counts.items():
+                    totals[key] = totals.get(key, 0) + count
+        return totals
+
+    async def flush(self, collection, final: bool = False) -> int:
+        """Write everything collected so far; returns the number of counters sent"""
+        from pymongo import UpdateOne
+        from pymongo.errors import BulkWriteError, PyMongoError
+
+        totals = self._collect(final)
+        if not totals:
+            return 0
+        keys = list(totals)
+        operations = [
+            UpdateOne(
+                {"_id": {"day": time.strftime("%Y-%m-%d", time.gmtime(day * 86400)), "assessment_id": assessment_id, "band": band}},
+                {"$inc": {"count": totals[(day, assessment_id, band)]}},
+                upsert=True,
+            )
+            for day, assessment_id, band in keys
+        ]
+        try:
+            await collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as exc:
+            # Unordered: everything but the listed operations was applied, so only those are retried
+            failed = [keys[error["index"]] for error in exc.details.get("writeErrors", [])]
+            self._keep_unsent({key: totals[key] for key in failed})
+            logger.warning("Completion counter flush: %s of %s upserts failed", len(failed), len(keys))
+            return len(keys) - len(failed)
+        except PyMongoError as exc:
+            self._keep_unsent(totals)
+            logger.warning("Completion counter flush failed, will retry: %s", exc)
+            return 0
+        return len(keys)
+
+    def _keep_unsent(self, counts: Dict[CompletionKey, int]) -> None:
+        for key, count in counts.items():
+            self._unsent[key] = self._unsent.get(key, 0) + count
+
+    def start(self, mongo: MongoManager) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run(mongo))
+
+    async def stop(self, mongo: MongoManager) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        try:
+            collection = (await mongo.get_database())[COMPLETION_COLLECTION]
+            await asyncio.wait_for(self.flush(collection, final=True), COMPLETION_SHUTDOWN_TIMEOUT)
+        except Exception as exc:
+            logger.warning("Dropping unflushed completion counts at shutdown: %s", exc)
+
+    async def _run(self, mongo: MongoManager) -> None:
+        collection = None
+        while True:
+            await asyncio.sleep(COMPLETION_FLUSH_SECONDS)
+            try:
+                if collection is None:
+                    collection = (await mongo.get_database())[COMPLETION_COLLECTION]
+                await self.flush(collection)
+            except Exception as exc:
+                logger.warning("Completion counter flush failed: %s", exc)
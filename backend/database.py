@@ -0,0 +1,178 @@
+"""
+The MongoDB connection: settings from the environment, a lazily created
+Motor client with pool limits, and pool statistics for the readiness probe.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, TYPE_CHECKING
+
+# motor/pymongo take ~150ms to import and are only needed once a database connection is
+# made, so they are imported there (in a worker thread) instead of delaying startup
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+@dataclass(frozen=True)
+class MongoSettings:
+    url: Optional[str]
+    db_name: str
+    max_pool_size: int
+    min_pool_size: int
+    max_idle_time_ms: int
+    connect_timeout_ms: int
+    server_selection_timeout_ms: int
+
+    @classmethod
+    def from_env(cls) -> "MongoSettings":
+        return cls(
+            url=os.environ.get('MONGO_URL') or None,
+            db_name=os.environ.get('DB_NAME', 'one_thought_db'),
+            max_pool_size=int(os.environ.get('MONGO_MAX_POOL_SIZE', '10')),
+            min_pool_size=int(os.environ.get('MONGO_MIN_POOL_SIZE', '0')),
+            max_idle_time_ms=int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', '300000')),
+            connect_timeout_ms=int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', '5000')),
+            server_selection_timeout_ms=int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000')),
+        )
+
+class PoolStats:
+    """Counts connection pool events; pymongo calls these from its own threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open = 0
+        self.checked_out = 0
+        self.created = 0
+        self.check_out_failures = 0
+        self.pool_clears = 0
+
+    def _add(self, **deltas) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def connection_created(self, event):
+        self._add(open=1, created=1)
+
+    def connection_closed(self, event):
+        self._add(open=-1)
+
+    def connection_checked_out(self, event):
+        self._add(checked_out=1)
+
+    def connection_checked_in(self, event):
+        self._add(checked_out=-1)
+
+    def connection_check_out_failed(self, event):
+        self._add(check_out_failures=1)
+
+    def pool_cleared(self, event):
+        self._add(pool_clears=1)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "open": self.open,
+                "checked_out": self.checked_out,
+                "created": self.created,
+                "check_out_failures": self.check_out_failures,
+                "pool_clears": self.pool_clears,
+            }
+
+def _pool_stats_listener() -> PoolStats:
+    """A PoolStats that pymongo accepts: it only takes subclasses of its own listener types"""
+    from pymongo.monitoring import ConnectionPoolListener
+
+    class PoolStatsListener(PoolStats, ConnectionPoolListener):
+        pass
+
+    return PoolStatsListener()
+
+class MongoManager:
+    """Owns the Motor client: created on first use, closed on shutdown.
+
+    Nothing touches the network at import, and the client is built in a
+    worker thread because resolving a mongodb+srv:// URL does blocking DNS
+    lookups. The app starts and serves without MONGO_URL; only the
+    background features that need the database are switched off.
+    """
+
+    def __init__(self, settings: MongoSettings):
+        self.settings = settings
+        self.pool_stats = PoolStats()
+        self._client: Optional["AsyncIOMotorClient"] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def configured(self) -> bool:
+        return self.settings.url is not None
+
+    @property
+    def connected(self) -> bool:
+        return self._client is not None
+
+    def _create_client(self) -> "AsyncIOMotorClient":
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        settings = self.settings
+        self.pool_stats = _pool_stats_listener()
+        return AsyncIOMotorClient(
+            settings.url,
+            maxPoolSize=settings.max_pool_size,
+            minPoolSize=settings.min_pool_size,
+            maxIdleTimeMS=settings.max_idle_time_ms,
+            connectTimeoutMS=settings.connect_timeout_ms,
+            serverSelectionTimeoutMS=settings.server_selection_timeout_ms,
+            event_listeners=[self.pool_stats],
+        )
+
+    async def get_database(self):
+        if not self.configured:
+            raise RuntimeError("MONGO_URL is not set")
+        if self._client is None:
+            async with self._lock:
+                if self._client is None:
+                    self._client = await asyncio.to_thread(self._create_client)
+        return self._client[self.settings.db_name]
+
+    async def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def readiness(self) -> dict:
+        """Database state for the readiness probe; never opens a connection on its own"""
+        if not self.configured:
+            return {"status": "disabled"}
+        if self._client is None:
+            return {"status": "not_connected"}
+        from pymongo.errors import PyMongoError
+
+        started = time.perf_counter()
+        try:
+            database = self._client[self.settings.db_name]
+            await asyncio.wait_for(database.command("ping"), self.settings.connect_timeout_ms / 1000)
+        except (PyMongoError, asyncio.TimeoutError) as exc:
+            return {"status": "unavailable", "error": type(exc).__name__, "pool": self.pool_stats.snapshot()}
+        return {
+            "status": "ok",
+            "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+            "pool": {**self.pool_stats.snapshot(), "max_size": self.settings.max_pool_size},
+        }
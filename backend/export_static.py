@@ -0,0 +1,110 @@
+"""
+Render every read endpoint of the API to static files, so a CDN or GitHub
+Pages can serve the catalog without Python:
+
+    cd backend && python export_static.py --out ../static-api
+
+Writes api/index.json (/api/), api/assessments.json, api/bundle.json
+(/api/bundle?ids=all), api/assessment/<id>.json and
+api/assessment/<id>/result/<score>.json, each next to .gz/.br
+siblings for hosts that serve precompressed files (left out only where
+compressing would not make the file smaller, i.e. the tiny index), plus
+manifest.json with the route, size, SHA-256, ETag and sibling encodings of
+every file. Bytes are identical to
+what the running API sends, and the output is deterministic, so unchanged
+catalogs export to unchanged files.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Dict
+
+# server first: it loads .env, which the modules after it read their settings from
+from server import catalog, mongo, root
+from catalog_store import CATALOG_COLLECTION, CatalogSnapshot
+from payloads import EncodedPayload
+
+logger = logging.getLogger("export_static")
+
+SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+
+def _describe(data: bytes) -> Dict:
+    return {"bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def _routes(snapshot: CatalogSnapshot) -> Dict[str, tuple]:
+    """{relative file path: (API route, payload)} for every read endpoint"""
+    routes = {
+        "api/index.json": ("/api/", EncodedPayload.from_content(asyncio.run(root()))),
+        "api/assessments.json": ("/api/assessments", snapshot.list_payload),
+    }
+    routes["api/bundle.json"] = ("/api/bundle?ids=all", snapshot.bundle(tuple(snapshot.entries)))
+    for assessment_id, entry in snapshot.entries.items():
+        routes[f"api/assessment/{assessment_id}.json"] = (f"/api/assessment/{assessment_id}", entry.payload)
+        for offset, payload in enumerate(entry.result_payloads):
+            score = entry.scorer.bands.min_score + offset
+            routes[f"api/assessment/{assessment_id}/result/{score}.json"] = (
+                f"/api/assessment/{assessment_id}/result/{score}", payload
+            )
+    return routes
+
+
+def export(snapshot: CatalogSnapshot, out_dir: Path) -> Dict:
+    """Write every file plus manifest.json under out_dir and return the manifest"""
+    files = {}
+    for relative_path, (route, payload) in _routes(snapshot).items():
+        # The live API skips compressing result bodies and compresses bundles quickly; offline
+        # there is time to give every file its best variants. Same body, so the same ETag.
+        payload = EncodedPayload.from_body(payload.identity)
+        path = out_dir / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(payload.identity)
+        encodings = {}
+        for coding, data in payload.variants.items():
+            path.with_name(path.name + SUFFIXES[coding]).write_bytes(data)
+            encodings[coding] = _describe(data)
+        files[relative_path] = {"route": route, **_describe(payload.identity), "etag": payload.etag(), "encodings": encodings}
+
+    manifest = {"assessments": list(snapshot.entries), "files": files}
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2) + "\n")
+    return manifest
+
+
+async def _load_from_database() -> CatalogSnapshot:
+    try:
+        database = await mongo.get_database()
+        await catalog.reload(database[CATALOG_COLLECTION])
+    finally:
+        await mongo.close()
+    return catalog.snapshot
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Export the read API as static files")
+    parser.add_argument("--out", default="static-api", help="output directory (default: static-api)")
+    parser.add_argument("--from-db", action="store_true",
+                        help=f"export the catalog as stored in MongoDB ({CATALOG_COLLECTION}) instead of the built-in one")
+    args = parser.parse_args()
+
+    snapshot = catalog.snapshot
+    if args.from_db:
+        if not mongo.configured:
+            logger.error("--from-db needs MONGO_URL")
+            return 1
+        snapshot = asyncio.run(_load_from_database())
+
+    out_dir = Path(args.out)
+    manifest = export(snapshot, out_dir)
+    total = sum(entry["bytes"] for entry in manifest["files"].values())
+    logger.info("Exported %s files (%s bytes uncompressed) to %s", len(manifest["files"]), total, out_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
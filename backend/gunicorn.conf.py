@@ -0,0 +1,63 @@
+"""
+Production server profile: gunicorn managing uvicorn workers.
+
+    cd backend && gunicorn -c gunicorn.conf.py server:app
+
+Worker count comes from WEB_CONCURRENCY, or one worker per CPU. The app is
+imported once in the master (preload_app) so the catalog snapshot and its
+pre-encoded payloads are built a single time and shared copy-on-write with
+every worker. MongoDB connections are opened lazily inside each worker,
+never in the master, so nothing fork-unsafe crosses the fork.
+
+Each worker counts its own requests; they share them through files in
+METRICS_DIR, so /api/metrics reports the whole server whichever worker
+answers (see metrics.MetricsDirectory).
+
+Signals: HUP starts fresh workers and retires the old ones gracefully
+(settings are re-read; code is not, because it was preloaded). To deploy
+new code without dropping requests send USR2 (start a new master), then
+WINCH and QUIT to the old master.
+"""
+
+import gc
+import multiprocessing
+import os
+import tempfile
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8001')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+# Seconds a worker may be silent before it is restarted, and how long
+# in-flight requests get to finish on reload or shutdown.
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+# Optionally recycle workers after this many requests (0 disables).
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = max_requests // 10
+
+# Read by server.py when it is preloaded; a fresh directory per start, kept across HUP and USR2
+if "METRICS_DIR" not in os.environ:
+    os.environ["METRICS_DIR"] = tempfile.mkdtemp(prefix="one-thought-metrics-")
+
+accesslog = None
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+
+def when_ready(server):
+    # Everything allocated while preloading (catalog, scorers, encoded bytes)
+    # is moved to the permanent generation, so garbage collections in the
+    # workers never write to those objects and un-share their pages.
+    gc.freeze()
+    server.log.info("Preloaded app; starting %s workers", workers)
+
+
+def child_exit(server, worker):
+    # A dead worker's requests stay counted; only its in-progress gauge is cleared
+    from metrics import retire_worker
+
+    retire_worker(os.environ["METRICS_DIR"], worker.pid)
@@ -0,0 +1,122 @@
+"""
+On-the-fly gzip/brotli compression for dynamic responses, including streams.
+"""
+
+import os
+import zlib
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+
+from payloads import brotli, choose_encoding
+
+# Dynamic responses smaller than this are sent as-is; catalog payloads are precompressed regardless
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', '512'))
+# Fast settings: these bodies are compressed per request, unlike the catalog (gzip 9 / brotli 11 once)
+GZIP_DYNAMIC_LEVEL = 6
+BROTLI_DYNAMIC_QUALITY = 4
+
+class _StreamCompressor:
+    """Incremental gzip/brotli encoder that flushes after every chunk so streams stay live"""
+
+    def __init__(self, coding: str):
+        if coding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_DYNAMIC_QUALITY)
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(GZIP_DYNAMIC_LEVEL, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing dynamic responses (scoring, metrics) on the fly.
+
+    Responses that already carry a Content-Encoding or an ETag are left
+    alone: those are EncodedPayload representations compressed at build
+    time, and recompressing them would break their per-coding ETags.
+    """
+
+    COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.codings = ["br", "gzip"] if brotli is not None else ["gzip"]
+
+    def _coding(self, scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                return choose_encoding(value.decode("latin-1"), self.codings)
+        return None
+
+    def _compressible(self, start_message) -> bool:
+        if start_message["status"] < 200 or start_message["status"] in (204, 304):
+            return False
+        headers = MutableHeaders(raw=start_message["headers"])
+        if "content-encoding" in headers or "etag" in headers:
+            return False
+        return headers.get("content-type", "").startswith(self.COMPRESSIBLE_TYPES)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = self._coding(scope)
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        def encoded_headers(message, length: Optional[int]):
+            headers = MutableHeaders(raw=message["headers"])
+            headers["Content-Encoding"] = coding
+            headers.add_vary_header("Accept-Encoding")
+            if length is None:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(length)
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                if self._compressible(message):
+                    start_message = message
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if not more_body:
+                    # Whole body in one message: compress only when it pays off
+                    if len(body) >= self.minimum_size:
+                        body = _StreamCompressor(coding).finish(body)
+                        encoded_headers(start_message, len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    passthrough = True
+                    return
+                # Streaming (e.g. batch NDJSON): the final size is unknown, so always encode
+                compressor = _StreamCompressor(coding)
+                encoded_headers(start_message, None)
+                await send(start_message)
+            data = compressor.chunk(body) if more_body else compressor.finish(body)
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,276 @@
+"""
+Per-route request metrics in the Prometheus text format, fed by a pure ASGI middleware.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from starlette.routing import Match
+
+logger = logging.getLogger(__name__)
+
+# Set by gunicorn.conf.py, so that /api/metrics adds up every worker; unset, it reports this process
+METRICS_DIR = os.environ.get('METRICS_DIR')
+METRICS_WRITE_SECONDS = float(os.environ.get('METRICS_WRITE_SECONDS', '5'))
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class Histogram:
+    """Fixed-bucket histogram; observe() touches a single bucket, render() makes it cumulative"""
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def add(self, counts: List[int], total: float, count: int) -> None:
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, counts)]
+        self.total += total
+        self.count += count
+
+    def render(self, name: str, labels: str) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.total}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+class RequestMetrics:
+    """Per-route request metrics for this process, rendered in the Prometheus text format.
+
+    Everything runs on the event loop thread, so plain dicts and ints are enough.
+    """
+    DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+    SIZE_BUCKETS = (100, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000)
+
+    def __init__(self):
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.durations: Dict[Tuple[str, str], Histogram] = {}
+        self.sizes: Dict[Tuple[str, str], Histogram] = {}
+        self.in_progress: Dict[Tuple[str, str], int] = {}
+
+    def started(self, key: Tuple[str, str]) -> None:
+        self.in_progress[key] = self.in_progress.get(key, 0) + 1
+
+    def finished(self, key: Tuple[str, str], status: int, seconds: float, size: int) -> None:
+        self.in_progress[key] -= 1
+        request_key = (*key, status)
+        self.requests[request_key] = self.requests.get(request_key, 0) + 1
+        duration = self.durations.get(key)
+        if duration is None:
+            duration = self.durations[key] = Histogram(self.DURATION_BUCKETS)
+            self.sizes[key] = Histogram(self.SIZE_BUCKETS)
+        duration.observe(seconds)
+        self.sizes[key].observe(size)
+
+    def to_state(self) -> dict:
+        """Every series as plain JSON, to be summed with other workers' by add_state()"""
+        return {
+            "requests": [[*key, count] for key, count in self.requests.items()],
+            "durations": [[*key, h.counts, h.total, h.count] for key, h in self.durations.items()],
+            "sizes": [[*key, h.counts, h.total, h.count] for key, h in self.sizes.items()],
+            "in_progress": [[*key, count] for key, count in self.in_progress.items()],
+        }
+
+    def add_state(self, state: Mapping) -> None:
+        for method, route, status, count in state.get("requests", ()):
+            key = (method, route, status)
+            self.requests[key] = self.requests.get(key, 0) + count
+        for name, histograms, bounds in (
+            ("durations", self.durations, self.DURATION_BUCKETS),
+            ("sizes", self.sizes, self.SIZE_BUCKETS),
+        ):
+            for method, route, counts, total, count in state.get(name, ()):
+                histogram = histograms.get((method, route))
+                if histogram is None:
+                    histogram = histograms[(method, route)] = Histogram(bounds)
+                histogram.add(counts, total, count)
+        for method, route, count in state.get("in_progress", ()):
+            self.in_progress[(method, route)] = self.in_progress.get((method, route), 0) + count
+
+    def render(self) -> str:
+        def labels(method: str, route: str) -> str:
+            return f'method="{method}",route="{_label_value(route)}"'
+
+        lines = [
+            "# HELP http_requests_total HTTP requests by route template and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(self.requests.items()):
+            lines.append(f'http_requests_total{{{labels(method, route)},status="{status}"}} {count}')
+        lines += [
+            "# HELP http_request_duration_seconds Time from request start to the last response byte.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for key, histogram in sorted(self.durations.items()):
+            lines += histogram.render("http_request_duration_seconds", labels(*key))
+        lines += [
+            "# HELP http_response_size_bytes Response body size as sent, after compression.",
+            "# TYPE http_response_size_bytes histogram",
+        ]
+        for key, histogram in sorted(self.sizes.items()):
+            lines += histogram.render("http_response_size_bytes", labels(*key))
+        lines += [
+            "# HELP http_requests_in_progress Requests currently being handled.",
+            "# TYPE http_requests_in_progress gauge",
+        ]
+        for key, count in sorted(self.in_progress.items()):
+            lines.append(f"http_requests_in_progress{{{labels(*key)}}} {count}")
+        return "\n".join(lines) + "\n"
+
+def _write_json(path: Path, content) -> None:
+    # Written aside and renamed into place, so readers never see half a file
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    temporary.write_text(json.dumps(content))
+    os.replace(temporary, path)
+
+class MetricsDirectory:
+    """RequestMetrics summed across gunicorn workers through one file per worker in a shared directory.
+
+    Every worker writes its snapshot each METRICS_WRITE_SECONDS and when it
+    answers a scrape, which adds up all the files. Whichever worker answers,
+    the totals cover the whole server and never go backwards, though other
+    workers' counts may trail by up to one write interval. A worker's file
+    outlives it (see retire_worker), so restarts keep their counts.
+    """
+
+    def __init__(self, directory: str, metrics: RequestMetrics):
+        self.directory = Path(directory)
+        self.metrics = metrics
+        self._pid: Optional[int] = None
+        self._path: Optional[Path] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _own_path(self) -> Path:
+        # Created in the gunicorn master (preload_app), so the file is named in the worker
+        pid = os.getpid()
+        if pid != self._pid:
+            self._pid = pid
+            # The timestamp keeps a reused pid from overwriting a dead worker's counts
+            self._path = self.directory / f"worker-{pid}-{time.time_ns()}.json"
+        return self._path
+
+    def write(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        _write_json(self._own_path(), self.metrics.to_state())
+
+    def render(self) -> str:
+        # A few small files, so reading them on the event loop costs less than a thread hop
+        self.write()
+        combined = RequestMetrics()
+        for path in sorted(self.directory.glob("worker-*.json")):
+            combined.add_state(json.loads(path.read_bytes()))
+        return combined.render()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # The last counts of a worker on its way out
+        self.write()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(METRICS_WRITE_SECONDS)
+            try:
+                self.write()
+            except OSError as exc:
+                logger.warning("Writing worker metrics failed: %s", exc)
+
+def retire_worker(directory: str, pid: int) -> None:
+    """Clear the in-progress gauge of a worker that has exited; its counters stay in the totals.
+
+    Called from gunicorn's child_exit hook in the master. The file is
+    rewritten in place rather than merged into another, so a scrape never
+    counts it twice.
+    """
+    for path in Path(directory).glob(f"worker-{pid}-*.json"):
+        state = json.loads(path.read_bytes())
+        state["in_progress"] = []
+        _write_json(path, state)
+
+class MetricsMiddleware:
+    """Pure ASGI middleware feeding RequestMetrics.
+
+    Requests are labelled with the matched route template, never the raw
+    path, so ids in URLs and scanner noise cannot blow up the label set.
+    """
+
+    UNMATCHED = "<unmatched>"
+    # Route matching costs ~20µs, so templates are remembered per (method, path) up to this many
+    TEMPLATE_CACHE_SIZE = 1024
+
+    def __init__(self, app, metrics: RequestMetrics, routes: List):
+        self.app = app
+        self.metrics = metrics
+        self.routes = routes
+        self._templates: Dict[Tuple[str, str], str] = {}
+
+    def _route_template(self, scope) -> str:
+        cache_key = (scope["method"], scope["path"])
+        template = self._templates.get(cache_key)
+        if template is None:
+            template = self._match_template(scope)
+            if len(self._templates) < self.TEMPLATE_CACHE_SIZE:
+                self._templates[cache_key] = template
+        return template
+
+    def _match_template(self, scope) -> str:
+        partial = None
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match is Match.FULL:
+                return route.path
+            if match is Match.PARTIAL and partial is None:
+                partial = route.path
+        return partial or self.UNMATCHED
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        key = (scope["method"], self._route_template(scope))
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        self.metrics.started(key)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.metrics.finished(key, status, time.perf_counter() - started, size)
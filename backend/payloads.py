@@ -0,0 +1,131 @@
+"""
+Pre-encoded JSON responses: each body is serialised and compressed once,
+then served with per-coding strong ETags and conditional GET support.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+def encode_json(content) -> bytes:
+    """Encode exactly like FastAPI's JSONResponse does"""
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+def _accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}"""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+def choose_encoding(accept_encoding: str, available: List[str]) -> Optional[str]:
+    """Pick the best available content-coding, preferring earlier entries on ties"""
+    if not accept_encoding:
+        return None
+    accepted = _accepted_encodings(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for coding in available:
+        quality = accepted.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+# Catalog responses may be reused for a few minutes, then must be revalidated with If-None-Match
+CATALOG_CACHE_CONTROL = os.environ.get('CATALOG_CACHE_CONTROL', 'public, max-age=300, must-revalidate')
+
+def _if_none_match_tags(if_none_match: str) -> List[str]:
+    """Split an If-None-Match header into opaque tags, ignoring weak prefixes"""
+    tags = []
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag:
+            tags.append(tag)
+    return tags
+
+@dataclass(frozen=True)
+class EncodedPayload:
+    """A JSON body encoded once, plus precompressed variants that are actually smaller"""
+    identity: bytes
+    variants: Dict[str, bytes]
+    digest: str
+
+    @classmethod
+    def from_content(cls, content, brotli_quality: Optional[int] = 11) -> "EncodedPayload":
+        return cls.from_body(encode_json(content), brotli_quality=brotli_quality)
+
+    @classmethod
+    def from_body(cls, body: bytes, brotli_quality: Optional[int] = 11, gzip_level: int = 9) -> "EncodedPayload":
+        """brotli_quality=None leaves the br variant to a later add_brotli(); gzip is served until then"""
+        variants = {}
+        if brotli is not None and brotli_quality is not None:
+            variants["br"] = brotli.compress(body, quality=brotli_quality)
+        variants["gzip"] = gzip.compress(body, compresslevel=gzip_level, mtime=0)
+        variants = {coding: data for coding, data in variants.items() if len(data) < len(body)}
+        return cls(identity=body, variants=variants, digest=hashlib.sha256(body).hexdigest()[:32])
+
+    def add_brotli(self, quality: int = 11) -> None:
+        """Compress the br variant deferred by from_body; safe while the payload is being served"""
+        if brotli is None or "br" in self.variants:
+            return
+        data = brotli.compress(self.identity, quality=quality)
+        if len(data) < len(self.identity):
+            # Swap in a new mapping rather than mutate the one a request may be reading; br stays first
+            object.__setattr__(self, "variants", {"br": data, **self.variants})
+
+    def etag(self, coding: Optional[str] = None) -> str:
+        """Strong ETag; each content-coding is a distinct representation"""
+        if coding is None:
+            return f'"{self.digest}"'
+        return f'"{self.digest}-{coding}"'
+
+    def matches(self, if_none_match: str) -> bool:
+        # Any coding of the same content counts as a match: the body is unchanged
+        for tag in _if_none_match_tags(if_none_match):
+            if tag == "*" or tag.strip('"').split("-", 1)[0] == self.digest:
+                return True
+        return False
+
+    def response(self, request: Request) -> Response:
+        coding = choose_encoding(request.headers.get("accept-encoding", ""), list(self.variants))
+        headers = {
+            "ETag": self.etag(coding),
+            "Cache-Control": CATALOG_CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        }
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and self.matches(if_none_match):
+            return Response(status_code=304, headers=headers)
+        if coding is None:
+            return Response(content=self.identity, media_type="application/json", headers=headers)
+        headers["Content-Encoding"] = coding
+        return Response(content=self.variants[coding], media_type="application/json", headers=headers)
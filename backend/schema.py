@@ -0,0 +1,150 @@
+"""
+Pydantic schema of the assessment catalog.
+"""
+
+from typing import Annotated, Dict, List, Union
+
+from pydantic import BaseModel, ConfigDict, Discriminator, Field, Tag, TypeAdapter
+
+# Catalog schema. Entries are validated once when a catalog snapshot is built; routes return
+# the pre-encoded bytes of validated entries, so these models only document responses.
+
+class CatalogModel(BaseModel):
+    """Rejects unknown keys: a misspelled "revrse" or "weigth" would otherwise be dropped silently"""
+    model_config = ConfigDict(extra="forbid")
+
+class AssessmentSummary(CatalogModel):
+    id: str
+    name: str
+    short_name: str
+    description: str
+    duration: str
+    image: str
+
+class AssessmentOption(CatalogModel):
+    text: str
+    value: int
+
+class AssessmentQuestion(CatalogModel):
+    id: int
+    text: str
+    options: List[AssessmentOption]
+    # Counted weight times (reverse: lowest + highest option value minus the answer)
+    weight: int = Field(default=1, ge=1)
+    reverse: bool = False
+
+class InterpretationBand(CatalogModel):
+    level: str
+    description: str
+    color: str
+    min: int
+    max: int
+
+class Subscale(CatalogModel):
+    """A score over some of the questions (by id), times multiplier, with its own bands"""
+    name: str
+    questions: List[int]
+    multiplier: int = Field(default=1, ge=1)
+    interpretation: Dict[str, InterpretationBand]
+
+class SafetyRule(CatalogModel):
+    """Raise flag whenever the answer to question (by id) is min_value or more, whatever the total"""
+    flag: str = Field(pattern=r"^[a-z_]+$")
+    question: int
+    min_value: int
+
+class SummedAssessment(CatalogModel):
+    """Questionnaire scored by summing option values and reading off the matching band"""
+    id: str
+    name: str
+    description: str
+    questions: List[AssessmentQuestion]
+    interpretation: Dict[str, InterpretationBand]
+    subscales: Dict[str, Subscale] = {}
+    safety_rules: List[SafetyRule] = []
+
+class TypologyOption(CatalogModel):
+    text: str
+    value: str = Field(pattern=r"^[A-Z]$")
+
+class TypologyQuestion(CatalogModel):
+    id: int
+    text: str
+    dimension: str = Field(pattern=r"^[A-Z]/[A-Z]$")
+    options: List[TypologyOption]
+
+class TypologyProfile(CatalogModel):
+    name: str
+    description: str
+    strengths: str
+    color: str
+
+class TypologyAssessment(CatalogModel):
+    """Questionnaire resolved to a type code (MBTI) by majority letter per dimension"""
+    id: str
+    name: str
+    description: str
+    questions: List[TypologyQuestion]
+    types: Dict[str, TypologyProfile]
+
+def _assessment_kind(value) -> str:
+    if isinstance(value, dict):
+        return "typology" if "types" in value else "summed"
+    return "typology" if isinstance(value, (TypologyAssessment, CompactTypologyAssessment)) else "summed"
+
+AssessmentData = Annotated[
+    Union[Annotated[SummedAssessment, Tag("summed")], Annotated[TypologyAssessment, Tag("typology")]],
+    Discriminator(_assessment_kind),
+]
+
+class AssessmentBundle(BaseModel):
+    assessments: List[AssessmentSummary]
+    details: Dict[str, AssessmentData]
+
+# ?format=compact: each distinct option list is sent once under "scales", and questions refer to
+# it by index instead of carrying "options"
+
+class CompactQuestion(CatalogModel):
+    """A summed question whose options are scales[scale]"""
+    id: int
+    text: str
+    scale: int = Field(ge=0)
+    weight: int = Field(default=1, ge=1)
+    reverse: bool = False
+
+class CompactSummedAssessment(CatalogModel):
+    id: str
+    name: str
+    description: str
+    scales: List[List[AssessmentOption]]
+    questions: List[CompactQuestion]
+    interpretation: Dict[str, InterpretationBand]
+    subscales: Dict[str, Subscale] = {}
+    safety_rules: List[SafetyRule] = []
+
+class CompactTypologyQuestion(CatalogModel):
+    """A typology question whose options are scales[scale]"""
+    id: int
+    text: str
+    dimension: str = Field(pattern=r"^[A-Z]/[A-Z]$")
+    scale: int = Field(ge=0)
+
+class CompactTypologyAssessment(CatalogModel):
+    id: str
+    name: str
+    description: str
+    scales: List[List[TypologyOption]]
+    questions: List[CompactTypologyQuestion]
+    types: Dict[str, TypologyProfile]
+
+CompactAssessmentData = Annotated[
+    Union[Annotated[CompactSummedAssessment, Tag("summed")], Annotated[CompactTypologyAssessment, Tag("typology")]],
+    Discriminator(_assessment_kind),
+]
+
+class CompactAssessmentBundle(BaseModel):
+    assessments: List[AssessmentSummary]
+    details: Dict[str, CompactAssessmentData]
+
+ASSESSMENT_SCHEMA = TypeAdapter(AssessmentData)
+SUMMARY_SCHEMA = TypeAdapter(AssessmentSummary)
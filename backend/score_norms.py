@@ -0,0 +1,151 @@
+"""
+Percentile lookup against reference score distributions stored in MongoDB.
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+
+from catalog_store import CatalogCache, CatalogSnapshot
+from database import MongoManager
+from scoring import SummedScorer
+
+logger = logging.getLogger(__name__)
+
+NORMS_COLLECTION = os.environ.get('NORMS_COLLECTION', 'score_norms')
+NORMS_POLL_SECONDS = float(os.environ.get('NORMS_POLL_SECONDS', '300'))
+
+@dataclass(frozen=True)
+class NormTable:
+    """A reference distribution of total scores, precomputed as one percentile per possible score.
+
+    The percentile is the share of the reference sample scoring below the
+    score, counting ties as half (mid-rank), so a lookup is one array index.
+    """
+    min_score: int
+    max_score: int
+    sample_size: int
+    percentiles: np.ndarray
+
+    @classmethod
+    def from_document(cls, document: Mapping, scorer: "SummedScorer") -> "NormTable":
+        """Build from {"_id": assessment id, "counts": [people scoring min_score, min_score + 1, ...]}"""
+        min_score, max_score = scorer.bands.min_score, scorer.bands.max_score
+        counts = document.get("counts")
+        if not isinstance(counts, list) or len(counts) != max_score - min_score + 1:
+            raise ValueError(f"Norms for {scorer.assessment_id!r} need one count per score {min_score}-{max_score}")
+        if not all(isinstance(count, int) and not isinstance(count, bool) and count >= 0 for count in counts):
+            raise ValueError(f"Norms for {scorer.assessment_id!r} must be non-negative integer counts")
+        counts = np.asarray(counts, dtype=np.int64)
+        sample_size = int(counts.sum())
+        if sample_size == 0:
+            raise ValueError(f"Norms for {scorer.assessment_id!r} are empty")
+        below = np.cumsum(counts) - counts
+        percentiles = np.round(100.0 * (below + counts / 2) / sample_size, 1)
+        percentiles.setflags(write=False)
+        return cls(min_score=min_score, max_score=max_score, sample_size=sample_size, percentiles=percentiles)
+
+    def fits(self, scorer: "SummedScorer") -> bool:
+        # A catalog edit can change the score range after the norms were loaded
+        return (self.min_score, self.max_score) == (scorer.bands.min_score, scorer.bands.max_score)
+
+    def lookup(self, score: int) -> float:
+        return float(self.percentiles[score - self.min_score])
+
+    def lookup_many(self, scores: np.ndarray) -> List[float]:
+        return self.percentiles[scores - self.min_score].tolist()
+
+class ScoreNorms:
+    """Norm tables per assessment, loaded from MongoDB and polled for changes.
+
+    Only documents that changed since the last poll are recompiled; the
+    mapping of tables is swapped in whole, like the catalog snapshot.
+    No norms ship with the app: without a document the percentile is null.
+    """
+
+    def __init__(self, catalog: CatalogCache):
+        self.catalog = catalog
+        self.tables: Mapping[str, NormTable] = MappingProxyType({})
+        self._documents: Dict[str, dict] = {}
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def percentile(self, scorer: "SummedScorer", score: int) -> Optional[float]:
+        table = self.tables.get(scorer.assessment_id)
+        if table is None or not table.fits(scorer):
+            return None
+        return table.lookup(score)
+
+    def percentiles(self, scorer: "SummedScorer", scores: np.ndarray) -> Optional[List[float]]:
+        table = self.tables.get(scorer.assessment_id)
+        if table is None or not table.fits(scorer):
+            return None
+        return table.lookup_many(scores)
+
+    def apply(self, documents: Dict[str, dict], snapshot: CatalogSnapshot) -> None:
+        """Rebuild tables for changed documents and drop those whose document is gone.
+
+        A new catalog snapshot may have changed score ranges, so then every table is
+        rebuilt from documents alone; none of the old ones is carried over.
+        """
+        changed = []
+        if snapshot is not self._snapshot:
+            changed.extend(self.tables)
+            self._documents.clear()
+            self._snapshot = snapshot
+            tables = {}
+        else:
+            tables = dict(self.tables)
+        for assessment_id in set(self._documents) - set(documents):
+            tables.pop(assessment_id, None)
+            del self._documents[assessment_id]
+            changed.append(assessment_id)
+        for assessment_id, document in documents.items():
+            if document == self._documents.get(assessment_id):
+                continue
+            self._documents[assessment_id] = document
+            changed.append(assessment_id)
+            entry = snapshot.entries.get(assessment_id)
+            try:
+                if entry is None or not isinstance(entry.scorer, SummedScorer):
+                    raise ValueError(f"{assessment_id!r} is not a summed-score assessment")
+                tables[assessment_id] = NormTable.from_document(document, entry.scorer)
+            except ValueError as exc:
+                logger.error("Ignoring norms document %r: %s", assessment_id, exc)
+                tables.pop(assessment_id, None)
+        if changed:
+            self.tables = MappingProxyType(tables)
+            logger.info("Score norms updated: %s", sorted(set(changed)))
+
+    async def reload(self, collection) -> None:
+        documents = {document["_id"]: document async for document in collection.find()}
+        self.apply(documents, self.catalog.snapshot)
+
+    def start(self, mongo: MongoManager) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(mongo))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, mongo: MongoManager) -> None:
+        collection = None
+        while True:
+            try:
+                if collection is None:
+                    collection = (await mongo.get_database())[NORMS_COLLECTION]
+                await self.reload(collection)
+            except Exception as exc:
+                logger.warning("Score norms sync failed: %s", exc)
+            await asyncio.sleep(NORMS_POLL_SECONDS)
@@ -0,0 +1,446 @@
+"""
+Scorers compiled from catalog entries: summed questionnaires with bands,
+weights, subscales and safety rules, and forced-choice typologies (MBTI).
+Each scores one answer set in pure Python and a batch with NumPy.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import product
+from operator import mul
+from typing import Dict, FrozenSet, List, Mapping, Tuple
+
+import numpy as np
+
+class ScoringError(ValueError):
+    """An answer set that does not fit the assessment's question/option definitions"""
+
+def _check_row_lengths(assessment_id: str, rows: List[List], question_count: int) -> None:
+    if not rows:
+        raise ScoringError(f"No responses given for {assessment_id!r}")
+    lengths = {len(row) for row in rows}
+    if lengths != {question_count}:
+        raise ScoringError(
+            f"Every {assessment_id!r} response needs {question_count} answers, got lengths {sorted(lengths)}"
+        )
+
+@dataclass(frozen=True)
+class BandIndex:
+    """Interpretation bands compiled into sorted numeric intervals.
+
+    compile() rejects gaps, overlaps and bands that do not exactly span the
+    possible score range, so lookup() is just a range check and a bisect.
+    """
+    min_score: int
+    max_score: int
+    floors: Tuple[int, ...]
+    bands: Tuple[Mapping, ...]
+    floors_array: np.ndarray
+
+    @classmethod
+    def compile(cls, assessment_id: str, interpretation: Mapping, min_score: int, max_score: int) -> "BandIndex":
+        ranges = sorted(
+            ((band["min"], band["max"], band) for band in interpretation.values()),
+            key=lambda item: item[0],
+        )
+        expected_low = min_score
+        for low, high, _ in ranges:
+            if low > high:
+                raise ValueError(f"Assessment {assessment_id!r} band {low}-{high} is empty")
+            if low > expected_low:
+                raise ValueError(f"Assessment {assessment_id!r} bands leave scores {expected_low}-{low - 1} uncovered")
+            if low < expected_low:
+                raise ValueError(f"Assessment {assessment_id!r} bands overlap at {low}-{min(high, expected_low - 1)}")
+            expected_low = high + 1
+        if expected_low != max_score + 1:
+            raise ValueError(
+                f"Assessment {assessment_id!r} bands end at {expected_low - 1} "
+                f"but scores run from {min_score} to {max_score}"
+            )
+        floors = tuple(low for low, _, _ in ranges)
+        return cls(
+            min_score=min_score,
+            max_score=max_score,
+            floors=floors,
+            bands=tuple(band for _, _, band in ranges),
+            floors_array=np.array(floors, dtype=np.int32),
+        )
+
+    def lookup(self, score: int) -> int:
+        """Index of the band containing score, in O(log bands)"""
+        if not self.min_score <= score <= self.max_score:
+            raise ScoringError(f"Score {score} is outside {self.min_score}-{self.max_score}")
+        return bisect_right(self.floors, score) - 1
+
+    def lookup_many(self, scores: np.ndarray) -> np.ndarray:
+        """Vectorised lookup() for an array of scores"""
+        outside = (scores < self.min_score) | (scores > self.max_score)
+        if outside.any():
+            raise ScoringError(f"Score {int(scores[outside][0])} is outside {self.min_score}-{self.max_score}")
+        return np.searchsorted(self.floors_array, scores, side="right") - 1
+
+@dataclass(frozen=True)
+class SafetyRules:
+    """An assessment's safety_rules compiled to question indexes and thresholds.
+
+    One answer set is checked with a comparison per rule; a batch with one
+    column comparison and one product with the rule -> flag matrix.
+    """
+    flags: Tuple[str, ...]
+    # (question index, threshold, flag index) per rule, in catalog order
+    rules: Tuple[Tuple[int, int, int], ...]
+    columns: np.ndarray
+    thresholds: np.ndarray
+    flag_matrix: np.ndarray
+
+    @classmethod
+    def compile(cls, assessment_id: str, rules: List[Mapping], allowed_values: Tuple[FrozenSet[int], ...]) -> "SafetyRules":
+        flags, compiled = [], []
+        for rule in rules:
+            index = rule["question"] - 1
+            if not 0 <= index < len(allowed_values):
+                raise ValueError(f"Assessment {assessment_id!r} safety rule {rule['flag']!r} names unknown question {rule['question']}")
+            if max(allowed_values[index]) < rule["min_value"]:
+                raise ValueError(
+                    f"Assessment {assessment_id!r} safety rule {rule['flag']!r} can never fire: "
+                    f"question {rule['question']} has no option of {rule['min_value']} or more"
+                )
+            if rule["flag"] not in flags:
+                flags.append(rule["flag"])
+            compiled.append((index, rule["min_value"], flags.index(rule["flag"])))
+        flag_matrix = np.zeros((len(compiled), len(flags)), dtype=np.int16)
+        flag_matrix[np.arange(len(compiled)), [flag for _, _, flag in compiled]] = 1
+        return cls(
+            flags=tuple(flags),
+            rules=tuple(compiled),
+            columns=np.array([index for index, _, _ in compiled], dtype=np.intp),
+            thresholds=np.array([threshold for _, threshold, _ in compiled], dtype=np.int16),
+            flag_matrix=flag_matrix,
+        )
+
+    def evaluate(self, answers: List[int]) -> List[str]:
+        """Flags raised by one validated answer set, in catalog order"""
+        raised = [False] * len(self.flags)
+        for index, threshold, flag in self.rules:
+            if answers[index] >= threshold:
+                raised[flag] = True
+        return [flag for flag, hit in zip(self.flags, raised) if hit]
+
+    def evaluate_matrix(self, matrix: np.ndarray) -> Dict[str, List[int]]:
+        """{flag: indexes of the rows that raise it} for a validated answer matrix"""
+        hits = (matrix[:, self.columns] >= self.thresholds).astype(np.int16) @ self.flag_matrix
+        return {flag: np.flatnonzero(hits[:, column]).tolist() for column, flag in enumerate(self.flags)}
+
+def _score_weights(assessment: Mapping, allowed_values: Tuple[FrozenSet[int], ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """Item weights, reverse keying and subscales as one affine map: scores = weights @ answers + offsets.
+
+    Row 0 is the total over every question; row k is the k-th subscale.
+    """
+    assessment_id = assessment["id"]
+    subscales = list(assessment.get("subscales", {}).items())
+    weights = np.zeros((1 + len(subscales), len(allowed_values)), dtype=np.int32)
+    offsets = np.zeros(1 + len(subscales), dtype=np.int32)
+    # A reverse-keyed answer v counts as (lowest + highest - v), i.e. coefficient -w and offset w * (lowest + highest)
+    item_weights = np.zeros(len(allowed_values), dtype=np.int32)
+    item_offsets = np.zeros(len(allowed_values), dtype=np.int32)
+    for index, (question, values) in enumerate(zip(assessment["questions"], allowed_values)):
+        weight = question.get("weight", 1)
+        if question.get("reverse"):
+            item_weights[index] = -weight
+            item_offsets[index] = weight * (min(values) + max(values))
+        else:
+            item_weights[index] = weight
+    weights[0] = item_weights
+    offsets[0] = item_offsets.sum()
+    for row, (key, subscale) in enumerate(subscales, start=1):
+        indexes = [question_id - 1 for question_id in subscale["questions"]]
+        if not indexes or len(set(indexes)) != len(indexes):
+            raise ValueError(f"Assessment {assessment_id!r} subscale {key!r} needs one or more distinct questions")
+        if not all(0 <= index < len(allowed_values) for index in indexes):
+            raise ValueError(f"Assessment {assessment_id!r} subscale {key!r} names unknown questions {subscale['questions']}")
+        multiplier = subscale.get("multiplier", 1)
+        weights[row, indexes] = multiplier * item_weights[indexes]
+        offsets[row] = multiplier * item_offsets[indexes].sum()
+    return weights, offsets
+
+def _score_bounds(weights: np.ndarray, offsets: np.ndarray, allowed_values: Tuple[FrozenSet[int], ...]) -> Tuple[List[int], List[int]]:
+    """Lowest and highest possible value of every score row"""
+    lowest = np.array([min(values) for values in allowed_values], dtype=np.int32)
+    highest = np.array([max(values) for values in allowed_values], dtype=np.int32)
+    low_end, high_end = weights * lowest, weights * highest
+    minimums = offsets + np.minimum(low_end, high_end).sum(axis=1)
+    maximums = offsets + np.maximum(low_end, high_end).sum(axis=1)
+    return minimums.tolist(), maximums.tolist()
+
+@dataclass(frozen=True)
+class SummedScorer:
+    """Scores an instrument whose result is a weighted sum of the chosen option values.
+
+    Weights, reverse keying and subscales compile to one integer matrix, so
+    scoring is a membership check per answer, one matrix-vector product
+    (matrix-matrix for batches) and a BandIndex lookup per score.
+    """
+    assessment_id: str
+    allowed_values: Tuple[FrozenSet[int], ...]
+    max_score: int
+    bands: BandIndex
+    # (key, name, max score, bands) per subscale, in catalog order
+    subscales: Tuple[Tuple[str, str, int, BandIndex], ...]
+    safety: SafetyRules
+    # Row 0 computes the total and row k subscale k: scores = weights @ answers + offsets
+    weights: np.ndarray
+    offsets: np.ndarray
+    # The same map as tuples: for one answer set a Python dot product beats numpy's per-call overhead
+    weight_rows: Tuple[Tuple[int, ...], ...]
+    offset_values: Tuple[int, ...]
+    # Vectorised form of allowed_values for batch scoring
+    min_value: int
+    allowed_table: np.ndarray
+
+    @classmethod
+    def compile(cls, assessment: Mapping) -> "SummedScorer":
+        assessment_id = assessment["id"]
+        allowed_values = tuple(
+            frozenset(option["value"] for option in question["options"])
+            for question in assessment["questions"]
+        )
+        min_value = min(min(values) for values in allowed_values)
+        max_value = max(max(values) for values in allowed_values)
+        if min_value < np.iinfo(np.int8).min or max_value > np.iinfo(np.int8).max:
+            raise ValueError(f"Assessment {assessment_id!r} option values do not fit in int8")
+        # allowed_table[question, value - min_value] is True when value is an option for question
+        allowed_table = np.zeros((len(allowed_values), max_value - min_value + 1), dtype=bool)
+        for index, values in enumerate(allowed_values):
+            allowed_table[index, [value - min_value for value in values]] = True
+        weights, offsets = _score_weights(assessment, allowed_values)
+        minimums, maximums = _score_bounds(weights, offsets, allowed_values)
+        subscales = tuple(
+            (key, subscale["name"], maximum,
+             BandIndex.compile(f"{assessment_id}/{key}", subscale["interpretation"], minimum, maximum))
+            for (key, subscale), minimum, maximum in zip(
+                assessment.get("subscales", {}).items(), minimums[1:], maximums[1:]
+            )
+        )
+        weights.setflags(write=False)
+        offsets.setflags(write=False)
+        return cls(
+            assessment_id=assessment_id,
+            allowed_values=allowed_values,
+            max_score=maximums[0],
+            bands=BandIndex.compile(assessment_id, assessment["interpretation"], minimums[0], maximums[0]),
+            subscales=subscales,
+            safety=SafetyRules.compile(assessment_id, assessment.get("safety_rules", ()), allowed_values),
+            weights=weights,
+            offsets=offsets,
+            weight_rows=tuple(tuple(row) for row in weights.tolist()),
+            offset_values=tuple(offsets.tolist()),
+            min_value=min_value,
+            allowed_table=allowed_table,
+        )
+
+    def score(self, answers: List[int]) -> dict:
+        if len(answers) != len(self.allowed_values):
+            raise ScoringError(f"Expected {len(self.allowed_values)} answers, got {len(answers)}")
+        for position, (value, allowed) in enumerate(zip(answers, self.allowed_values), start=1):
+            if value not in allowed:
+                raise ScoringError(f"Answer {value!r} is not an option for question {position}")
+        scores = [
+            offset + sum(map(mul, row, answers))
+            for row, offset in zip(self.weight_rows, self.offset_values)
+        ]
+        result = self.result(scores[0])
+        if self.subscales:
+            result["subscales"] = {
+                key: {
+                    "name": name,
+                    "score": score,
+                    "max_score": max_score,
+                    "interpretation": bands.bands[bands.lookup(score)],
+                }
+                for (key, name, max_score, bands), score in zip(self.subscales, scores[1:])
+            }
+        result["flags"] = self.safety.evaluate(answers)
+        return result
+
+    def result(self, total: int) -> dict:
+        return {
+            "assessment_id": self.assessment_id,
+            "score": total,
+            "max_score": self.max_score,
+            "interpretation": self.bands.bands[self.bands.lookup(total)],
+        }
+
+    def to_matrix(self, rows: List[List[int]]) -> np.ndarray:
+        """Validate a batch of answer rows and return it as an (n, questions) int8 matrix"""
+        _check_row_lengths(self.assessment_id, rows, len(self.allowed_values))
+        matrix = np.array(rows)
+        if matrix.dtype.kind not in "iu":
+            raise ScoringError(f"Every {self.assessment_id!r} answer must be a numeric option value")
+        offsets = matrix - self.min_value
+        width = self.allowed_table.shape[1]
+        in_range = (offsets >= 0) & (offsets < width)
+        valid = in_range & self.allowed_table[np.arange(matrix.shape[1]), np.clip(offsets, 0, width - 1)]
+        if not valid.all():
+            row, column = (int(axis[0]) for axis in np.nonzero(~valid))
+            raise ScoringError(
+                f"Response {row} answer {int(matrix[row, column])!r} is not an option "
+                f"for {self.assessment_id!r} question {column + 1}"
+            )
+        return matrix.astype(np.int8)
+
+    def score_matrix(self, matrix: np.ndarray) -> dict:
+        """Score a validated int8 answer matrix: one matrix product and one searchsorted per score"""
+        if len(self.weights) == 1:
+            # One row of weights is a matrix-vector product; numpy keeps int8 @ int32 in int32
+            all_scores = (matrix @ self.weights[0] + self.offsets[0])[np.newaxis]
+        else:
+            all_scores = (matrix @ self.weights.T + self.offsets).T
+        scores = all_scores[0]
+        band_index = self.bands.lookup_many(scores)
+        result = {
+            "assessment_id": self.assessment_id,
+            "count": int(matrix.shape[0]),
+            "max_score": self.max_score,
+            "scores": scores.tolist(),
+            "bands": band_index.tolist(),
+            "interpretation": self.bands.bands,
+        }
+        if self.subscales:
+            result["subscales"] = {
+                key: {
+                    "name": name,
+                    "max_score": max_score,
+                    "scores": subscale_scores.tolist(),
+                    "bands": bands.lookup_many(subscale_scores).tolist(),
+                    "interpretation": bands.bands,
+                }
+                for (key, name, max_score, bands), subscale_scores in zip(self.subscales, all_scores[1:])
+            }
+        result["flags"] = self.safety.evaluate_matrix(matrix)
+        return result
+
+@dataclass(frozen=True)
+class TypologyScorer:
+    """Scores a forced-choice typology (MBTI) by tallying letters per dimension.
+
+    Each question maps its letters to (dimension index, pole) at compile
+    time, so an answer set is tallied in a single pass with dict lookups.
+    """
+    assessment_id: str
+    dimensions: Tuple[str, ...]
+    poles: Tuple[Tuple[str, str], ...]
+    letter_map: Tuple[Mapping[str, Tuple[int, int]], ...]
+    questions_per_dimension: Tuple[int, ...]
+    types: Mapping
+    # Vectorised forms for batch scoring
+    first_letters: np.ndarray
+    second_letters: np.ndarray
+    dimension_matrix: np.ndarray
+
+    @classmethod
+    def compile(cls, assessment: Mapping) -> "TypologyScorer":
+        dimensions, poles, letter_map = [], [], []
+        for question in assessment["questions"]:
+            dimension = question["dimension"]
+            if dimension not in dimensions:
+                dimensions.append(dimension)
+                poles.append(tuple(dimension.split("/")))
+            index = dimensions.index(dimension)
+            letters = {}
+            for option in question["options"]:
+                if option["value"] not in poles[index]:
+                    raise ValueError(
+                        f"Assessment {assessment['id']!r} question {question['id']} option "
+                        f"{option['value']!r} is not a pole of {dimension}"
+                    )
+                letters[option["value"]] = (index, poles[index].index(option["value"]))
+            letter_map.append(letters)
+        missing = [
+            "".join(letters) for letters in product(*poles)
+            if "".join(letters) not in assessment["types"]
+        ]
+        if missing:
+            raise ValueError(f"Assessment {assessment['id']!r} has no types entry for {missing}")
+        dimension_of = [next(iter(letters.values()))[0] for letters in letter_map]
+        dimension_matrix = np.zeros((len(letter_map), len(dimensions)), dtype=np.int16)
+        dimension_matrix[np.arange(len(letter_map)), dimension_of] = 1
+        return cls(
+            assessment_id=assessment["id"],
+            dimensions=tuple(dimensions),
+            poles=tuple(poles),
+            letter_map=tuple(letter_map),
+            questions_per_dimension=tuple(int(count) for count in dimension_matrix.sum(axis=0)),
+            types=assessment["types"],
+            first_letters=np.array([poles[index][0] for index in dimension_of]),
+            second_letters=np.array([poles[index][1] for index in dimension_of]),
+            dimension_matrix=dimension_matrix,
+        )
+
+    def _type_of(self, second_counts) -> str:
+        # Ties go to the first pole, matching ResultsMBTI.js
+        return "".join(
+            first if second * 2 <= total else second_letter
+            for (first, second_letter), second, total in zip(self.poles, second_counts, self.questions_per_dimension)
+        )
+
+    def score(self, answers: List[str]) -> dict:
+        if len(answers) != len(self.letter_map):
+            raise ScoringError(f"Expected {len(self.letter_map)} answers, got {len(answers)}")
+        second_counts = [0] * len(self.dimensions)
+        for position, (value, letters) in enumerate(zip(answers, self.letter_map), start=1):
+            mapped = letters.get(value)
+            if mapped is None:
+                raise ScoringError(f"Answer {value!r} is not an option for question {position}")
+            second_counts[mapped[0]] += mapped[1]
+        personality_type = self._type_of(second_counts)
+        return {
+            "assessment_id": self.assessment_id,
+            "type": personality_type,
+            "dimensions": {
+                dimension: {
+                    first: round(100 * (total - second) / total, 1),
+                    second_letter: round(100 * second / total, 1),
+                }
+                for dimension, (first, second_letter), second, total in zip(
+                    self.dimensions, self.poles, second_counts, self.questions_per_dimension
+                )
+            },
+            "profile": self.types[personality_type],
+        }
+
+    def to_matrix(self, rows: List[List[str]]) -> np.ndarray:
+        """Validate a batch of letter rows and return an (n, questions) int8 matrix of second-pole flags"""
+        _check_row_lengths(self.assessment_id, rows, len(self.letter_map))
+        letters = np.array(rows)
+        if letters.dtype.kind != "U":
+            raise ScoringError(f"Every {self.assessment_id!r} answer must be a letter")
+        second = letters == self.second_letters
+        valid = second | (letters == self.first_letters)
+        if not valid.all():
+            row, column = (int(axis[0]) for axis in np.nonzero(~valid))
+            raise ScoringError(
+                f"Response {row} answer {str(letters[row, column])!r} is not an option "
+                f"for {self.assessment_id!r} question {column + 1}"
+            )
+        return second.astype(np.int8)
+
+    def score_matrix(self, matrix: np.ndarray) -> dict:
+        """Tally a validated flag matrix with one matrix product per batch"""
+        second_counts = matrix @ self.dimension_matrix
+        totals = np.array(self.questions_per_dimension)
+        first_percent = np.round(100 * (totals - second_counts) / totals, 1)
+        types = [self._type_of(row) for row in second_counts.tolist()]
+        return {
+            "assessment_id": self.assessment_id,
+            "count": int(matrix.shape[0]),
+            "dimensions": self.dimensions,
+            "types": types,
+            # Percentage for the first pole of each dimension; the second is 100 minus this
+            "percentages": first_percent.tolist(),
+            "profiles": {personality_type: self.types[personality_type] for personality_type in sorted(set(types))},
+        }
+
+def compile_scorer(assessment: Mapping):
+    if "types" in assessment:
+        return TypologyScorer.compile(assessment)
+    return SummedScorer.compile(assessment)
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Backend Benchmark for Mental Health Assessment Website
+Drives every API endpoint concurrently and reports latency percentiles and throughput
+
+Targets:
+  inprocess  server:app through httpx's ASGI transport (default, no network)
+  uvicorn    server:app started on localhost in a subprocess
+  gunicorn   server:app under backend/gunicorn.conf.py (the production profile)
+  --url      any running deployment
+
+Results can be saved as a JSON baseline and later runs compared against it;
+a run that regresses beyond --tolerance exits with status 1.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+ROOT_DIR = Path(__file__).parent
+BACKEND_DIR = ROOT_DIR / "backend"
+BASELINE_DIR = ROOT_DIR / "test_reports" / "benchmarks"
+sys.path.insert(0, str(BACKEND_DIR))
+
+MICRO_PATHS = [
+    "/api/",
+    "/api/assessments",
+    "/api/assessment/phq9",
+    "/api/assessment/mbti",
+]
+
+
+# ---------------------------------------------------------------------------
+# Load suite
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+async def build_scenarios(client):
+    """Every endpoint, with request bodies generated from the live catalog"""
+    assessments = (await client.get("/api/assessments")).json()
+    details = {a["id"]: (await client.get(f"/api/assessment/{a['id']}")).json() for a in assessments}
+    phq9_etag = (await client.get("/api/assessment/phq9")).headers.get("etag")
+    rng = random.Random(42)
+
+    def random_answers(assessment_id):
+        return [rng.choice(q["options"])["value"] for q in details[assessment_id]["questions"]]
+
+    scenarios = [
+        {"name": "GET /api/", "method": "GET", "path": "/api/"},
+        {"name": "GET /api/assessments", "method": "GET", "path": "/api/assessments"},
+        {"name": "GET /api/assessments (br)", "method": "GET", "path": "/api/assessments",
+         "headers": {"Accept-Encoding": "br, gzip"}},
+    ]
+    for assessment_id in details:
+        scenarios.append({"name": f"GET /api/assessment/{assessment_id}", "method": "GET",
+                          "path": f"/api/assessment/{assessment_id}"})
+    scenarios.append({"name": "GET /api/assessment/unknown (404)", "method": "GET",
+                      "path": "/api/assessment/unknown", "expect": 404})
+    scenarios.append({"name": "GET /api/assessment/phq9/result/12", "method": "GET",
+                      "path": "/api/assessment/phq9/result/12"})
+    scenarios.append({"name": "GET /api/bundle?ids=all", "method": "GET", "path": "/api/bundle?ids=all",
+                      "headers": {"Accept-Encoding": "br, gzip"}})
+    if phq9_etag:
+        scenarios.append({"name": "GET /api/assessment/phq9 (304)", "method": "GET",
+                          "path": "/api/assessment/phq9", "headers": {"If-None-Match": phq9_etag},
+                          "expect": 304})
+    scenarios += [
+        {"name": "POST /api/assessment/phq9/score", "method": "POST",
+         "path": "/api/assessment/phq9/score", "json": {"answers": random_answers("phq9")}},
+        {"name": "POST /api/assessment/mbti/score", "method": "POST",
+         "path": "/api/assessment/mbti/score", "json": {"answers": random_answers("mbti")}},
+        {"name": "POST /api/score/batch (1000 rows)", "method": "POST", "path": "/api/score/batch",
+         "json": {"responses": {
+             "phq9": [random_answers("phq9") for _ in range(500)],
+             "gad7": [random_answers("gad7") for _ in range(500)],
+         }}},
+        {"name": "GET /api/ready", "method": "GET", "path": "/api/ready"},
+        {"name": "GET /api/metrics", "method": "GET", "path": "/api/metrics"},
+    ]
+    return scenarios
+
+
+async def run_scenario(client, scenario, requests, concurrency):
+    latencies = []
+    errors = 0
+    remaining = requests
+    expected = scenario.get("expect", 200)
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                response = await client.request(
+                    scenario["method"], scenario["path"],
+                    headers=scenario.get("headers"), json=scenario.get("json"),
+                )
+                await response.aread()
+                ok = response.status_code == expected
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def start_server(target, workers):
+    """Start server:app on a free localhost port and wait until /api/ answers"""
+    port = free_port()
+    env = dict(os.environ)
+    if target == "gunicorn":
+        command = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--bind",
+                   f"127.0.0.1:{port}", "--log-level", "warning", "server:app"]
+        env["WEB_CONCURRENCY"] = str(workers)
+    else:
+        command = [sys.executable, "-m", "uvicorn", "server:app", "--host", "127.0.0.1",
+                   "--port", str(port), "--log-level", "warning", "--workers", str(workers)]
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    async with httpx.AsyncClient(base_url=base_url) as probe:
+        for _ in range(100):
+            try:
+                if (await probe.get("/api/")).status_code == 200:
+                    return process, base_url
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f"{target} did not become ready within 10s")
+
+
+def _server_app():
+    from server import app
+
+    # server.py turns on INFO logging, under which httpx logs every request: thousands of lines
+    # burying the results, all written inside the timed window
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    return app
+
+
+async def run_suite(args):
+    process = None
+    if args.url:
+        target = args.url
+        transport = None
+        base_url = args.url.rstrip("/")
+    elif args.target in ("uvicorn", "gunicorn"):
+        process, base_url = await start_server(args.target, args.workers)
+        target = f"{args.target} x{args.workers}"
+        transport = None
+    else:
+        target = "inprocess"
+        transport = httpx.ASGITransport(app=_server_app())
+        base_url = "http://benchmark"
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, transport=transport, limits=limits,
+                                     timeout=args.timeout) as client:
+            scenarios = await build_scenarios(client)
+            if args.only:
+                scenarios = [s for s in scenarios if any(term in s["name"] for term in args.only)]
+
+            print(f"Target: {target}   concurrency: {args.concurrency}   requests/scenario: {args.requests}")
+            print(f"{'Scenario':<42} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'err':>5}")
+            print("-" * 84)
+            results = {}
+            for scenario in scenarios:
+                await run_scenario(client, scenario, min(args.concurrency, args.requests), args.concurrency)
+                result = await run_scenario(client, scenario, args.requests, args.concurrency)
+                results[scenario["name"]] = result
+                print(f"{scenario['name']:<42} {result['throughput_rps']:>9.0f} {result['p50_ms']:>8.2f} "
+                      f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['errors']:>5}")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "target": target,
+        "concurrency": args.concurrency,
+        "requests_per_scenario": args.requests,
+        "python": platform.python_version(),
+        "machine": f"{platform.machine()} x{os.cpu_count()}",
+        "scenarios": results,
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Return a list of regressions beyond tolerance (a fraction, e.g. 0.2 for 20%)"""
+    regressions = []
+    for name, result in report["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        if result["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {before['throughput_rps']} -> {result['throughput_rps']} req/s")
+        if result["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {before['p95_ms']} -> {result['p95_ms']} ms")
+        if result["errors"] > before["errors"]:
+            regressions.append(f"{name}: errors {before['errors']} -> {result['errors']}")
+    return regressions
+
+
+# ---------------------------------------------------------------------------
+# Micro benchmark: sequential requests straight through the ASGI callable
+# ---------------------------------------------------------------------------
+
+async def asgi_get(app, path, headers=()):
+    """Send a single GET request straight through the ASGI app"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"benchmark")] + [
+            (name.lower().encode(), value.encode()) for name, value in headers
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("benchmark", 80),
+    }
+    response = {"status": None, "body": b""}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    await app(scope, receive, send)
+    return response
+
+
+async def bench_path(app, path, requests, headers=()):
+    """Return (requests/sec, response size) for sequential GETs of path"""
+    warmup = await asgi_get(app, path, headers)
+    if warmup["status"] != 200:
+        raise RuntimeError(f"{path} returned {warmup['status']}")
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await asgi_get(app, path, headers)
+    elapsed = time.perf_counter() - start
+    return requests / elapsed, len(warmup["body"])
+
+
+async def bench_metrics_overhead(app, requests):
+    """Per-request cost of MetricsMiddleware, measured around a do-nothing ASGI app"""
+    from metrics import MetricsMiddleware, RequestMetrics
+
+    async def noop_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    scope = {"type": "http", "method": "GET", "path": "/api/assessment/phq9", "root_path": ""}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    async def timed(asgi_app):
+        start = time.perf_counter()
+        for _ in range(requests):
+            await asgi_app(scope, receive, send)
+        return (time.perf_counter() - start) / requests
+
+    instrumented = MetricsMiddleware(noop_app, metrics=RequestMetrics(), routes=app.router.routes)
+    bare = await timed(noop_app)
+    wrapped = await timed(instrumented)
+    return (wrapped - bare) * 1e6
+
+
+def bench_schema_validation(rounds):
+    """Seconds to validate the whole catalog and the PHQ-9 detail alone against the pydantic schema"""
+    from catalog_store import _with_numeric_bands
+    from schema import ASSESSMENT_SCHEMA
+    from server import _seed_documents
+
+    # The raw details as CatalogEntry.build validates them, not the frozen copies it serves
+    details = {
+        document["_id"]: _with_numeric_bands(document["_id"], document["detail"]) for document in _seed_documents()
+    }
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for detail in details.values():
+            ASSESSMENT_SCHEMA.validate_python(detail, strict=True)
+    whole = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        ASSESSMENT_SCHEMA.validate_python(details["phq9"], strict=True)
+    single = (time.perf_counter() - start) / rounds
+    return whole, single
+
+
+async def run_micro(paths, requests, headers=()):
+    app = _server_app()
+
+    print(f"{'Endpoint':<28} {'req/s':>10} {'bytes':>8}")
+    print("-" * 48)
+    rates = {}
+    for path in paths:
+        rps, size = await bench_path(app, path, requests, headers)
+        rates[path] = rps
+        print(f"{path:<28} {rps:>10.0f} {size:>8}")
+    overhead = await bench_metrics_overhead(app, requests * 10)
+    print("-" * 48)
+    print(f"{'Metrics middleware overhead':<28} {overhead:>7.1f} µs/request")
+
+    # Validation runs when a catalog snapshot is built, never per request; this shows what it would cost there
+    whole, single = bench_schema_validation(max(1, requests // 10))
+    print(f"{'Catalog schema validation':<28} {whole * 1e3:>7.2f} ms per snapshot build")
+    if "/api/assessment/phq9" in rates:
+        request_seconds = 1 / rates["/api/assessment/phq9"]
+        print(f"{'  if done per PHQ-9 request':<28} {single * 1e6:>7.1f} µs/request "
+              f"(+{single / request_seconds:.0%} over the served request)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=["inprocess", "uvicorn", "gunicorn"], default="inprocess")
+    parser.add_argument("--url", help="benchmark a running deployment instead, e.g. http://localhost:8001")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes for --target uvicorn/gunicorn")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32, help="requests in flight at once")
+    parser.add_argument("--timeout", type=float, default=10.0, help="per-request timeout in seconds")
+    parser.add_argument("--only", nargs="*", help="run only scenarios whose name contains one of these")
+    parser.add_argument("--save", nargs="?", const="", metavar="PATH",
+                        help=f"save the report as JSON (default: {BASELINE_DIR.relative_to(ROOT_DIR)}/<timestamp>.json)")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved report")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression vs baseline (0.2 = 20%%)")
+    parser.add_argument("--micro", action="store_true",
+                        help="sequential in-process req/s for a few paths, plus metrics middleware overhead")
+    parser.add_argument("--accept-encoding", default="", help="with --micro, e.g. 'gzip' or 'br, gzip'")
+    parser.add_argument("paths", nargs="*", default=MICRO_PATHS, help="with --micro, the paths to request")
+    args = parser.parse_args()
+
+    print("⏱  Mental Health Assessment API Benchmark")
+    print("=" * 84)
+
+    if args.micro:
+        headers = [("accept-encoding", args.accept_encoding)] if args.accept_encoding else []
+        asyncio.run(run_micro(args.paths, args.requests, headers))
+        return 0
+
+    report = asyncio.run(run_suite(args))
+
+    if args.save is not None:
+        path = Path(args.save) if args.save else BASELINE_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\n💾 Saved report to {path}")
+
+    if args.baseline:
+        regressions = compare(report, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%} vs {args.baseline}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            return 1
+        print(f"\n✅ No regressions beyond {args.tolerance:.0%} vs {args.baseline}")
+
+    errors = sum(result["errors"] for result in report["scenarios"].values())
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,183 +1,515 @@
 #!/usr/bin/env python3
 """
 Backend API Testing for Mental Health Assessment Website
-Tests all API endpoints for PHQ-9, GAD-7, ASRS, and Burnout assessments
+Tests all API endpoints: the assessment catalog, scoring, readiness and metrics
+
+Checks run concurrently (bounded by --concurrency) against a deployed URL or,
+with --inprocess, straight against server:app without any network.
+A machine-readable report is written to test_reports/backend_api.json.
 """
 
-import requests
+import argparse
+import asyncio
+import httpx
+import os
 import sys
 import json
+import time
 from datetime import datetime
+from pathlib import Path
+
+DEFAULT_BASE_URL = os.environ.get("BACKEND_URL", "https://mental-health-test-3.preview.emergentagent.com")
+DEFAULT_REPORT = Path(__file__).parent / "test_reports" / "backend_api.json"
+
+# Question count of every assessment in the catalog
+ASSESSMENT_CONFIGS = {
+    'phq9': 9,
+    'gad7': 7,
+    'social_anxiety': 7,
+    'asrs': 6,
+    'burnout': 8,
+    'overthinking': 7,
+    'emotional_exhaustion': 6,
+    'nervous_system': 7,
+    'fatigue': 6,
+    'people_pleasing': 7,
+    'mbti': 16,
+}
+
+
+class Check:
+    """Outcome of one API check: status, timing and any notes about the payload"""
+
+    def __init__(self, name, method, url, expected_status):
+        self.name = name
+        self.method = method
+        self.url = url
+        self.expected = expected_status
+        self.actual = None
+        self.passed = False
+        self.duration_ms = None
+        self.error = None
+        self.response_text = None
+        self.notes = []
+
+    def note(self, message):
+        self.notes.append(message)
+
+    def fail(self, message):
+        """Fail a check whose status was right but whose payload was not"""
+        self.passed = False
+        self.notes.append(message)
+
+    def print(self):
+        print(f"\n🔍 Testing {self.name}...")
+        print(f"   URL: {self.method} {self.url}")
+        if self.passed:
+            print(f"✅ Passed - Status: {self.actual} ({self.duration_ms:.1f} ms)")
+        elif self.error:
+            print(f"❌ Failed - Error: {self.error}")
+        elif self.actual == self.expected:
+            print(f"❌ Failed - Status: {self.actual}, but the response was wrong")
+        else:
+            print(f"❌ Failed - Expected {self.expected}, got {self.actual}")
+            print(f"   Response: {self.response_text}")
+        for message in self.notes:
+            print(f"   {message}")
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'method': self.method,
+            'url': self.url,
+            'expected': self.expected,
+            'actual': self.actual,
+            'passed': self.passed,
+            'duration_ms': self.duration_ms,
+            'error': self.error,
+            'notes': self.notes,
+        }
+
 
 class MentalHealthAPITester:
-    def __init__(self, base_url="https://mental-health-test-3.preview.emergentagent.com"):
+    def __init__(self, base_url=DEFAULT_BASE_URL, transport=None, concurrency=8, timeout=10):
         self.base_url = base_url
         self.api_base = f"{base_url}/api"
-        self.tests_run = 0
-        self.tests_passed = 0
-        self.failed_tests = []
+        self.transport = transport
+        self.timeout = timeout
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.client = None
+        self.checks = []
+
+    async def __aenter__(self):
+        self.client = httpx.AsyncClient(transport=self.transport, timeout=self.timeout)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
 
-    def run_test(self, name, method, endpoint, expected_status, data=None):
-        """Run a single API test"""
+    @property
+    def tests_run(self):
+        return len(self.checks)
+
+    @property
+    def tests_passed(self):
+        return sum(check.passed for check in self.checks)
+
+    @property
+    def failed_tests(self):
+        return [check for check in self.checks if not check.passed]
+
+    async def run_test(self, name, method, endpoint, expected_status, data=None, extra_headers=None):
+        """Run a single API test; returns (check, response_data, response)"""
         url = f"{self.api_base}{endpoint}"
         headers = {'Content-Type': 'application/json'}
+        if extra_headers:
+            headers.update(extra_headers)
+
+        check = Check(name, method, url, expected_status)
+        self.checks.append(check)
 
-        self.tests_run += 1
-        print(f"\n🔍 Testing {name}...")
-        print(f"   URL: {url}")
-        
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers, timeout=10)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers, timeout=10)
-
-            success = response.status_code == expected_status
-            if success:
-                self.tests_passed += 1
-                print(f"✅ Passed - Status: {response.status_code}")
-                try:
-                    response_data = response.json()
-                    if isinstance(response_data, list):
-                        print(f"   Response: List with {len(response_data)} items")
-                    elif isinstance(response_data, dict):
-                        if 'message' in response_data:
-                            print(f"   Response: {response_data['message']}")
-                        elif 'name' in response_data:
-                            print(f"   Response: {response_data['name']}")
-                        else:
-                            print(f"   Response: Dict with {len(response_data)} keys")
-                    return True, response_data
-                except:
-                    return True, {}
+            async with self.semaphore:
+                start = time.perf_counter()
+                if method == 'GET':
+                    response = await self.client.get(url, headers=headers)
+                elif method == 'POST':
+                    response = await self.client.post(url, json=data, headers=headers)
+                check.duration_ms = round((time.perf_counter() - start) * 1000, 3)
+        except Exception as e:
+            check.error = str(e) or type(e).__name__
+            return check, {}, None
+
+        check.actual = response.status_code
+        check.passed = response.status_code == expected_status
+        if not check.passed:
+            check.response_text = response.text
+            return check, {}, response
+
+        try:
+            response_data = response.json()
+        except ValueError:
+            return check, {}, response
+        if isinstance(response_data, list):
+            check.note(f"Response: List with {len(response_data)} items")
+        elif isinstance(response_data, dict):
+            if 'message' in response_data:
+                check.note(f"Response: {response_data['message']}")
+            elif 'name' in response_data:
+                check.note(f"Response: {response_data['name']}")
             else:
-                print(f"❌ Failed - Expected {expected_status}, got {response.status_code}")
-                print(f"   Response: {response.text}")
-                self.failed_tests.append({
-                    'name': name,
-                    'expected': expected_status,
-                    'actual': response.status_code,
-                    'response': response.text
-                })
-                return False, {}
+                check.note(f"Response: Dict with {len(response_data)} keys")
+        return check, response_data, response
 
-        except Exception as e:
-            print(f"❌ Failed - Error: {str(e)}")
-            self.failed_tests.append({
-                'name': name,
-                'error': str(e)
-            })
-            return False, {}
-
-    def test_root_endpoint(self):
+    async def test_root_endpoint(self):
         """Test API root endpoint"""
-        return self.run_test(
+        check, _, _ = await self.run_test(
             "API Root Endpoint",
             "GET",
             "/",
             200
         )
+        return check
 
-    def test_get_assessments(self):
+    async def test_get_assessments(self):
         """Test getting list of assessments"""
-        success, response = self.run_test(
+        check, response, _ = await self.run_test(
             "Get Assessments List",
             "GET",
             "/assessments",
             200
         )
-        
-        if success and response:
+
+        if check.passed and response:
             # Validate response structure
-            expected_assessments = ['phq9', 'gad7', 'asrs', 'burnout']
-            if isinstance(response, list) and len(response) == 4:
-                print(f"   ✓ Found {len(response)} assessments")
+            if isinstance(response, list) and len(response) == len(ASSESSMENT_CONFIGS):
+                check.note(f"✓ Found {len(response)} assessments")
                 for assessment in response:
-                    if 'id' in assessment and assessment['id'] in expected_assessments:
-                        print(f"   ✓ Found {assessment['id']}: {assessment.get('name', 'N/A')}")
+                    if 'id' in assessment and assessment['id'] in ASSESSMENT_CONFIGS:
+                        check.note(f"✓ Found {assessment['id']}: {assessment.get('name', 'N/A')}")
                     else:
-                        print(f"   ⚠ Unexpected assessment format: {assessment}")
+                        check.fail(f"⚠ Unexpected assessment format: {assessment}")
             else:
-                print(f"   ⚠ Unexpected response format or count")
-        
-        return success, response
+                check.fail(f"⚠ Expected {len(ASSESSMENT_CONFIGS)} assessments, got {len(response)}")
+
+        return check
 
-    def test_assessment_detail(self, assessment_id, expected_question_count=None):
+    async def test_assessment_detail(self, assessment_id, expected_question_count=None):
         """Test getting specific assessment details"""
-        success, response = self.run_test(
+        check, response, _ = await self.run_test(
             f"Get {assessment_id.upper()} Assessment Detail",
             "GET",
             f"/assessment/{assessment_id}",
             200
         )
-        
-        if success and response:
-            # Validate response structure
-            required_fields = ['id', 'name', 'description', 'questions', 'interpretation']
+
+        if check.passed and response:
+            # Validate response structure; MBTI carries types instead of score bands
+            required_fields = ['id', 'name', 'description', 'questions']
+            required_fields.append('types' if assessment_id == 'mbti' else 'interpretation')
             missing_fields = [field for field in required_fields if field not in response]
-            
+
             if not missing_fields:
-                print(f"   ✓ All required fields present")
+                check.note("✓ All required fields present")
                 if 'questions' in response and isinstance(response['questions'], list):
                     question_count = len(response['questions'])
-                    print(f"   ✓ Found {question_count} questions")
-                    
+                    check.note(f"✓ Found {question_count} questions")
+
                     if expected_question_count and question_count != expected_question_count:
-                        print(f"   ⚠ Expected {expected_question_count} questions, got {question_count}")
-                    
+                        check.fail(f"⚠ Expected {expected_question_count} questions, got {question_count}")
+
                     # Check first question structure
                     if question_count > 0:
                         first_q = response['questions'][0]
                         if all(key in first_q for key in ['id', 'text', 'options']):
-                            print(f"   ✓ Question structure valid")
-                            print(f"   ✓ First question: '{first_q['text'][:50]}...'")
+                            check.note("✓ Question structure valid")
+                            check.note(f"✓ First question: '{first_q['text'][:50]}...'")
                         else:
-                            print(f"   ⚠ Invalid question structure")
-                
+                            check.fail("⚠ Invalid question structure")
+
                 if 'interpretation' in response:
                     interp_keys = list(response['interpretation'].keys())
-                    print(f"   ✓ Interpretation ranges: {interp_keys}")
-                    
+                    check.note(f"✓ Interpretation ranges: {interp_keys}")
+
+            else:
+                check.fail(f"⚠ Missing required fields: {missing_fields}")
+
+        return check
+
+    async def test_conditional_get(self, assessment_id):
+        """Test that a repeat request with the ETag is answered with 304 and no body"""
+        check, _, response = await self.run_test(
+            f"Get {assessment_id.upper()} Assessment ETag",
+            "GET",
+            f"/assessment/{assessment_id}",
+            200
+        )
+        etag = response.headers.get('ETag') if check.passed else None
+        if not etag:
+            check.fail("⚠ No ETag header returned")
+            return check
+
+        check, _, response = await self.run_test(
+            f"Conditional Get {assessment_id.upper()} Assessment",
+            "GET",
+            f"/assessment/{assessment_id}",
+            304,
+            extra_headers={'If-None-Match': etag}
+        )
+        if check.passed and response.content:
+            check.fail(f"⚠ 304 response carried {len(response.content)} body bytes")
+        return check
+
+    async def test_bundle(self, ids):
+        """Test the list and several details arrive in one response"""
+        check, response, _ = await self.run_test(
+            f"Get Bundle {','.join(ids)}",
+            "GET",
+            f"/bundle?ids={','.join(ids)}",
+            200
+        )
+
+        if check.passed and response:
+            details = response.get('details', {})
+            if len(response.get('assessments', [])) == len(ASSESSMENT_CONFIGS) and set(details) == set(ids):
+                check.note(f"✓ List plus details for {sorted(details)}")
+            else:
+                check.fail(f"⚠ Unexpected bundle: {len(response.get('assessments', []))} listed, details {sorted(details)}")
+
+        return check
+
+    async def test_score_assessment(self, assessment_id, answers, expected_score, expected_level):
+        """Test server-side scoring of an answer vector"""
+        check, response, _ = await self.run_test(
+            f"Score {assessment_id.upper()} Assessment",
+            "POST",
+            f"/assessment/{assessment_id}/score",
+            200,
+            data={'answers': answers}
+        )
+
+        if check.passed and response:
+            level = response.get('interpretation', {}).get('level')
+            if response.get('score') == expected_score and level == expected_level:
+                check.note(f"✓ Score {expected_score} interpreted as {level}")
+            else:
+                check.fail(f"⚠ Expected {expected_score}/{expected_level}, got {response.get('score')}/{level}")
+            if 'percentile' not in response:
+                check.fail("⚠ Response has no percentile field")
+
+        return check
+
+    async def test_safety_flags(self, assessment_id, answers, expected_flags):
+        """Test that item-level safety rules raise flags whatever the total score"""
+        check, response, _ = await self.run_test(
+            f"Safety Flags for {assessment_id.upper()} {answers}",
+            "POST",
+            f"/assessment/{assessment_id}/score",
+            200,
+            data={'answers': answers}
+        )
+
+        if check.passed and response:
+            if response.get('flags') == expected_flags:
+                check.note(f"✓ Flags {expected_flags} at score {response.get('score')}")
+            else:
+                check.fail(f"⚠ Expected flags {expected_flags}, got {response.get('flags')}")
+
+        return check
+
+    async def test_result_lookup(self, assessment_id, score, expected_level):
+        """Test the cacheable score -> interpretation lookup"""
+        check, response, _ = await self.run_test(
+            f"Result for {assessment_id.upper()} Score {score}",
+            "GET",
+            f"/assessment/{assessment_id}/result/{score}",
+            200 if expected_level else 422
+        )
+
+        if check.passed and expected_level:
+            level = response.get('interpretation', {}).get('level')
+            if level == expected_level:
+                check.note(f"✓ Score {score} interpreted as {level}")
             else:
-                print(f"   ⚠ Missing required fields: {missing_fields}")
-        
-        return success, response
+                check.fail(f"⚠ Expected {expected_level}, got {level}")
 
-    def test_invalid_assessment(self):
+        return check
+
+    async def test_score_invalid_answers(self, assessment_id, answers):
+        """Test that answers outside the question/option definitions are rejected"""
+        check, _, _ = await self.run_test(
+            f"Score {assessment_id.upper()} With Invalid Answers {answers}",
+            "POST",
+            f"/assessment/{assessment_id}/score",
+            422,
+            data={'answers': answers}
+        )
+        return check
+
+    async def test_score_mbti(self, answers, expected_type):
+        """Test server-side MBTI dimension tallying"""
+        check, response, _ = await self.run_test(
+            f"Score MBTI Assessment as {expected_type}",
+            "POST",
+            "/assessment/mbti/score",
+            200,
+            data={'answers': answers}
+        )
+
+        if check.passed and response:
+            if response.get('type') == expected_type and 'profile' in response:
+                check.note(f"✓ Type {expected_type}: {response['profile'].get('name')}")
+            else:
+                check.fail(f"⚠ Expected {expected_type}, got {response.get('type')}")
+
+        return check
+
+    async def test_score_batch(self, responses):
+        """Test batch scoring; the API streams one NDJSON line per assessment"""
+        check, _, response = await self.run_test(
+            "Batch Score Assessments",
+            "POST",
+            "/score/batch",
+            200,
+            data={'responses': responses}
+        )
+
+        if check.passed:
+            results = [json.loads(line) for line in response.text.splitlines() if line]
+            for result in results:
+                expected_count = len(responses.get(result.get('assessment_id'), []))
+                if result.get('count') == expected_count and len(result.get('scores', [])) == expected_count:
+                    check.note(f"✓ {result['assessment_id']}: {result['count']} scored in {result.get('elapsed_ms')} ms")
+                else:
+                    check.fail(f"⚠ Unexpected batch result: {result}")
+            if len(results) != len(responses):
+                check.fail(f"⚠ Expected {len(responses)} result lines, got {len(results)}")
+
+        return check
+
+    async def test_readiness(self):
+        """Test the readiness probe reports database state"""
+        check, response, _ = await self.run_test(
+            "Readiness Probe",
+            "GET",
+            "/ready",
+            200
+        )
+
+        if check.passed and response:
+            check.note(f"✓ Database: {response.get('database', {}).get('status')}")
+
+        return check
+
+    async def test_metrics_endpoint(self):
+        """Test Prometheus metrics are exposed per route template"""
+        check, _, response = await self.run_test(
+            "Prometheus Metrics",
+            "GET",
+            "/metrics",
+            200
+        )
+
+        if check.passed:
+            text = response.text
+            if 'http_requests_total{' in text and 'route="/api/assessment/{assessment_id}"' in text:
+                check.note("✓ Request metrics labelled by route template")
+            else:
+                check.fail("⚠ Expected per-route request metrics")
+
+        return check
+
+    async def test_invalid_assessment(self):
         """Test getting non-existent assessment"""
-        return self.run_test(
+        check, _, _ = await self.run_test(
             "Invalid Assessment ID",
-            "GET", 
+            "GET",
             "/assessment/invalid",
-            200  # The API returns 200 with error message rather than 404
+            404
         )
+        return check
+
+    async def run_all(self):
+        """Run every check concurrently; metrics go last so they include the requests above"""
+        checks = [
+            self.test_root_endpoint(),
+            self.test_get_assessments(),
+            *(self.test_assessment_detail(assessment_id, expected_questions)
+              for assessment_id, expected_questions in ASSESSMENT_CONFIGS.items()),
+            self.test_conditional_get('phq9'),
+            self.test_bundle(['phq9', 'gad7']),
+            self.test_score_assessment('phq9', [1] * 9, 9, 'Mild'),
+            self.test_score_assessment('gad7', [3] * 7, 21, 'Severe'),
+            self.test_safety_flags('phq9', [0] * 8 + [1], ['self_harm']),
+            self.test_safety_flags('phq9', [3] * 8 + [0], []),
+            self.test_result_lookup('phq9', 9, 'Mild'),
+            self.test_result_lookup('phq9', 28, None),
+            self.test_score_invalid_answers('phq9', [4] * 9),
+            self.test_score_invalid_answers('phq9', [1] * 8),
+            self.test_score_invalid_answers('phq9', [True] + [1] * 8),
+            self.test_score_invalid_answers('phq9', [1.0] * 9),
+            self.test_score_mbti(['E', 'E', 'E', 'E', 'S', 'S', 'S', 'S', 'T', 'T', 'T', 'T', 'J', 'J', 'J', 'J'], 'ESTJ'),
+            self.test_score_mbti(['I', 'I', 'I', 'I', 'N', 'N', 'N', 'N', 'F', 'F', 'F', 'F', 'P', 'P', 'P', 'P'], 'INFP'),
+            self.test_score_batch({
+                'phq9': [[0] * 9, [1] * 9, [3] * 9],
+                'gad7': [[2] * 7, [0] * 7]
+            }),
+            self.test_readiness(),
+            self.test_invalid_assessment(),
+        ]
+        await asyncio.gather(*checks)
+        await self.test_metrics_endpoint()
+
+    def report(self, duration_ms, concurrency):
+        return {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'base_url': self.base_url,
+            'transport': 'inprocess' if self.transport else 'http',
+            'concurrency': concurrency,
+            'duration_ms': duration_ms,
+            'tests_run': self.tests_run,
+            'tests_passed': self.tests_passed,
+            'success_rate': round(self.tests_passed / self.tests_run * 100, 1) if self.tests_run else 0.0,
+            'checks': [check.to_dict() for check in self.checks],
+        }
+
+
+async def run(args):
+    transport = None
+    base_url = args.base_url.rstrip('/')
+    if args.inprocess:
+        sys.path.insert(0, str(Path(__file__).parent / "backend"))
+        from server import app
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://inprocess"
+
+    async with MentalHealthAPITester(base_url, transport, args.concurrency, args.timeout) as tester:
+        start = time.perf_counter()
+        await tester.run_all()
+        duration_ms = round((time.perf_counter() - start) * 1000, 3)
+    return tester, tester.report(duration_ms, args.concurrency)
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Mental Health Assessment API tests")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="deployment to test (env BACKEND_URL)")
+    parser.add_argument("--inprocess", action="store_true", help="test server:app in-process instead of over HTTP")
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight at once")
+    parser.add_argument("--timeout", type=float, default=10.0, help="per-request timeout in seconds")
+    parser.add_argument("--report", default=str(DEFAULT_REPORT), help="where to write the JSON report")
+    args = parser.parse_args()
+
     print("🧠 Mental Health Assessment API Testing")
     print("="*50)
-    
-    tester = MentalHealthAPITester()
-    
-    # Test root endpoint
-    tester.test_root_endpoint()
-    
-    # Test assessments list
-    success, assessments = tester.test_get_assessments()
-    
-    # Test each assessment in detail
-    assessment_configs = {
-        'phq9': 9,      # PHQ-9 has 9 questions
-        'gad7': 7,      # GAD-7 has 7 questions  
-        'asrs': 6,      # ASRS has 6 questions
-        'burnout': 8    # Burnout has 8 questions
-    }
-    
-    for assessment_id, expected_questions in assessment_configs.items():
-        tester.test_assessment_detail(assessment_id, expected_questions)
-    
-    # Test invalid assessment
-    tester.test_invalid_assessment()
-    
+
+    tester, report = asyncio.run(run(args))
+    for check in tester.checks:
+        check.print()
+
+    report_path = Path(args.report)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2) + "\n")
+
     # Print summary
     print("\n" + "="*50)
     print("📊 TEST SUMMARY")
@@ -185,18 +517,20 @@ def main():
     print(f"Tests Run: {tester.tests_run}")
     print(f"Tests Passed: {tester.tests_passed}")
     print(f"Tests Failed: {tester.tests_run - tester.tests_passed}")
-    print(f"Success Rate: {(tester.tests_passed/tester.tests_run)*100:.1f}%")
-    
+    print(f"Success Rate: {report['success_rate']:.1f}%")
+    print(f"Duration: {report['duration_ms']:.0f} ms with concurrency {args.concurrency}")
+    print(f"Report: {report_path}")
+
     if tester.failed_tests:
         print("\n❌ FAILED TESTS:")
         for i, test in enumerate(tester.failed_tests, 1):
-            print(f"{i}. {test['name']}")
-            if 'error' in test:
-                print(f"   Error: {test['error']}")
+            print(f"{i}. {test.name}")
+            if test.error:
+                print(f"   Error: {test.error}")
             else:
-                print(f"   Expected: {test['expected']}, Got: {test['actual']}")
-    
+                print(f"   Expected: {test.expected}, Got: {test.actual}")
+
     return 0 if tester.tests_passed == tester.tests_run else 1
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
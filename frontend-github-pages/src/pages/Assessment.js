@@ -47,7 +47,7 @@ const Assessment = () => {
 
   const submitAssessment = () => {
     const totalScore = Object.values(answers).reduce((sum, val) => sum + val, 0);
-    navigate(`/results/${assessmentId}`, { state: { score: totalScore, assessment } });
+    navigate(`/results/${assessmentId}`, { state: { score: totalScore, answers, assessment } });
   };
 
   if (loading || !assessment) {
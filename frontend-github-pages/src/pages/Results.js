@@ -15,14 +15,16 @@ const Results = () => {
       return;
     }
 
-    const { score, assessment } = location.state;
+    const { score, answers, assessment } = location.state;
     const interpretation = getInterpretation(score, assessment.interpretation);
-    setResult({ score, interpretation, assessmentName: assessment.name });
+    const safetyFlags = getSafetyFlags(answers || {}, assessment.safety_rules || []);
+    setResult({ score, interpretation, safetyFlags, assessmentName: assessment.name });
   }, [location, navigate]);
 
   const getInterpretation = (score, interpretationData) => {
     for (const [range, data] of Object.entries(interpretationData)) {
-      const [min, max] = range.split("-").map(Number);
+      // The API sends numeric bounds; only fall back to parsing the "min-max" key for older payloads
+      const [min, max] = data.min !== undefined ? [data.min, data.max] : range.split("-").map(Number);
       if (score >= min && score <= max) {
         return data;
       }
@@ -30,6 +32,10 @@ const Results = () => {
     return interpretationData[Object.keys(interpretationData)[0]];
   };
 
+  // Same rules the API applies when scoring: an item answered at or above min_value raises the flag
+  const getSafetyFlags = (answers, rules) =>
+    rules.filter((rule) => answers[rule.question] >= rule.min_value).map((rule) => rule.flag);
+
   if (!result) {
     return (
       <div className="min-h-screen flex items-center justify-center">
@@ -128,8 +134,8 @@ const Results = () => {
           </div>
         </motion.div>
 
-        {/* Crisis Support */}
-        {(result.interpretation.level.includes("Severe") || 
+        {/* Crisis Support - for high scores, and always when a safety rule fires */}
+        {(result.safetyFlags.length > 0 || result.interpretation.level.includes("Severe") ||
           result.interpretation.level.includes("High")) && (
           <motion.div
             initial={{ opacity: 0 }}
@@ -51,7 +51,7 @@ const Assessment = () => {
       navigate(`/results-mbti/${assessmentId}`, { state: { answers, assessment } });
     } else {
       const totalScore = Object.values(answers).reduce((sum, val) => sum + val, 0);
-      navigate(`/results/${assessmentId}`, { state: { score: totalScore, assessment } });
+      navigate(`/results/${assessmentId}`, { state: { score: totalScore, answers, assessment } });
     }
   };
 
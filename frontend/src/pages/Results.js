@@ -27,9 +27,10 @@ const Results = () => {
     // Check if state exists (passed from navigation)
     if (location.state && location.state.score !== undefined) {
       hasProcessedState.current = true;
-      const { score, assessment } = location.state;
+      const { score, answers, assessment } = location.state;
       const interpretation = getInterpretation(score, assessment.interpretation);
-      setResult({ score, interpretation, assessmentName: assessment.name });
+      const safetyFlags = getSafetyFlags(answers || {}, assessment.safety_rules || []);
+      setResult({ score, interpretation, safetyFlags, assessmentName: assessment.name });
     } else {
       // Small delay to ensure state is fully propagated before redirecting
       const timer = setTimeout(() => {
@@ -43,7 +44,8 @@ const Results = () => {
 
   const getInterpretation = (score, interpretationData) => {
     for (const [range, data] of Object.entries(interpretationData)) {
-      const [min, max] = range.split("-").map(Number);
+      // The API sends numeric bounds; only fall back to parsing the "min-max" key for older payloads
+      const [min, max] = data.min !== undefined ? [data.min, data.max] : range.split("-").map(Number);
       if (score >= min && score <= max) {
         return data;
       }
@@ -51,6 +53,10 @@ const Results = () => {
     return interpretationData[Object.keys(interpretationData)[0]];
   };
 
+  // Same rules the API applies when scoring: an item answered at or above min_value raises the flag
+  const getSafetyFlags = (answers, rules) =>
+    rules.filter((rule) => answers[rule.question] >= rule.min_value).map((rule) => rule.flag);
+
   if (!result) {
     return (
       <div className="min-h-screen flex items-center justify-center">
@@ -289,9 +295,9 @@ const Results = () => {
           )}
         </motion.div>
 
-        {/* Crisis Support - Only show with full results */}
-        {showFullResults && (result.interpretation.level.includes("Severe") || 
-          result.interpretation.level.includes("High")) && (
+        {/* Crisis Support - with full results for high scores, and always when a safety rule fires */}
+        {(result.safetyFlags.length > 0 || (showFullResults && (result.interpretation.level.includes("Severe") ||
+          result.interpretation.level.includes("High")))) && (
           <motion.div
             initial={{ opacity: 0 }}
             animate={{ opacity: 1 }}
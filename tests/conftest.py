@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The backend runs from its own directory (gunicorn server:app), so its modules import each other top-level
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class MockMongo:
+    """Stands in for MongoManager, backed by an in-memory mongomock-motor database"""
+
+    configured = True
+
+    def __init__(self):
+        from mongomock_motor import AsyncMongoMockClient
+
+        self.database = AsyncMongoMockClient()["one_thought_test"]
+
+    async def get_database(self):
+        return self.database
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def mock_mongo():
+    return MockMongo()
@@ -0,0 +1,358 @@
+import asyncio
+import copy
+import json
+import logging
+import threading
+import time
+
+import httpx
+import pytest
+from pydantic import TypeAdapter
+from pymongo.errors import OperationFailure
+
+import catalog_store
+import server
+from bson.int64 import Int64
+
+from catalog_store import _OPTION_SCALES, CATALOG_COLLECTION, CatalogCache, CatalogEntry, build_catalog
+from payloads import brotli
+from schema import ASSESSMENT_SCHEMA, CompactAssessmentBundle, CompactAssessmentData
+
+pytestmark = pytest.mark.anyio
+
+
+def _cache() -> CatalogCache:
+    return CatalogCache(server.catalog.snapshot, server._seed_documents())
+
+
+def _document(assessment_id: str) -> dict:
+    return copy.deepcopy(next(d for d in server._seed_documents() if d["_id"] == assessment_id))
+
+
+async def _eventually(condition, timeout: float = 3.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not await condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.parametrize("value", [2.0, "2"])
+def test_build_rejects_option_values_that_are_not_ints(value):
+    document = _document("phq9")
+    document["detail"]["questions"][0]["options"][2]["value"] = value
+    with pytest.raises(ValueError):
+        CatalogEntry.from_document(document)
+
+
+@pytest.mark.parametrize("assessment_id, field", [("mbti", "dimensoin"), ("phq9", "revrse")])
+def test_build_rejects_unknown_question_keys(assessment_id, field):
+    document = _document(assessment_id)
+    document["detail"]["questions"][0][field] = document["detail"]["questions"][0].get("dimension", True)
+    with pytest.raises(ValueError):
+        CatalogEntry.from_document(document)
+
+
+def test_build_accepts_mongo_int64():
+    document = _document("phq9")
+    document["position"] = Int64(0)
+    document["detail"]["questions"][0]["options"][2]["value"] = Int64(2)
+    entry = CatalogEntry.from_document(document)
+    assert entry.scorer.max_score == 27
+
+
+def _expand_compact(compact: dict) -> dict:
+    scales = compact.pop("scales")
+    compact["questions"] = [
+        {**{key: value for key, value in question.items() if key != "scale"}, "options": scales[question["scale"]]}
+        for question in compact["questions"]
+    ]
+    return compact
+
+
+@pytest.mark.parametrize("assessment_id", ["phq9", "mbti"])
+def test_compact_detail_lists_each_scale_once_and_expands_to_the_full_detail(assessment_id):
+    entry = server.catalog.snapshot.entries[assessment_id]
+    compact = json.loads(entry.compact_payload.identity)
+    full = json.loads(entry.payload.identity)
+    assert len(compact["scales"]) == len({json.dumps(question["options"]) for question in full["questions"]})
+    # "scales" comes just before the questions that refer to it
+    position = list(full).index("questions")
+    assert list(compact) == [*list(full)[:position], "scales", *list(full)[position:]]
+    assert _expand_compact(compact) == full
+
+
+def test_compact_payloads_match_the_documented_schema():
+    snapshot = server.catalog.snapshot
+    for assessment_id, entry in snapshot.entries.items():
+        ASSESSMENT_SCHEMA.validate_json(entry.payload.identity, strict=True)
+        compact = TypeAdapter(CompactAssessmentData).validate_json(entry.compact_payload.identity, strict=True)
+        assert all(question.scale < len(compact.scales) for question in compact.questions), assessment_id
+    bundle = snapshot.bundle(tuple(snapshot.entries), "compact")
+    assert set(CompactAssessmentBundle.model_validate_json(bundle.identity).details) == snapshot.ids
+
+
+async def test_compact_detail_has_its_own_etag():
+    entry = server.catalog.snapshot.entries["phq9"]
+    assert entry.compact_payload.digest != entry.payload.digest
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://test") as client:
+        full = await client.get("/api/assessment/phq9")
+        compact = await client.get("/api/assessment/phq9", params={"format": "compact"})
+        assert compact.headers["ETag"] != full.headers["ETag"]
+
+        stale = await client.get(
+            "/api/assessment/phq9", params={"format": "compact"}, headers={"If-None-Match": full.headers["ETag"]}
+        )
+        assert stale.status_code == 200
+        assert "scales" in stale.json()
+        fresh = await client.get(
+            "/api/assessment/phq9", params={"format": "compact"}, headers={"If-None-Match": compact.headers["ETag"]}
+        )
+        assert fresh.status_code == 304
+
+
+@pytest.mark.skipif(brotli is None, reason="brotli is not installed")
+async def test_brotli_variants_are_added_once_serving():
+    cache = CatalogCache(build_catalog(server._ASSESSMENT_SUMMARIES, server._ASSESSMENT_DETAILS), server._seed_documents())
+    payload = cache.snapshot.entries["phq9"].payload
+    assert list(payload.variants) == ["gzip"]
+    gzip_etag = payload.etag("gzip")
+
+    cache.compress()
+    await cache.stop()
+    assert list(payload.variants) == ["br", "gzip"]
+    assert list(cache.snapshot.entries["phq9"].compact_payload.variants) == ["br", "gzip"]
+    # The content is unchanged, so a client holding the gzip ETag still gets its 304
+    assert payload.matches(gzip_etag)
+
+
+async def test_option_scales_no_longer_served_are_forgotten():
+    cache = _cache()
+    edited = _document("gad7")
+    for question in edited["detail"]["questions"]:
+        question["options"][0]["text"] = "Never at all"
+    await cache.apply({"gad7": edited})
+    new_scale = cache.snapshot.entries["gad7"].detail["questions"][0]["options"]
+    assert any(options is new_scale for options in _OPTION_SCALES.values())
+
+    await cache.apply({"gad7": _document("gad7")})
+    assert not any(options is new_scale for options in _OPTION_SCALES.values())
+    # Scales still in use stay shared between assessments
+    phq9_scale = cache.snapshot.entries["phq9"].detail["questions"][0]["options"]
+    assert cache.snapshot.entries["gad7"].detail["questions"][0]["options"] is phq9_scale
+
+
+async def test_rejected_documents_leave_no_option_scales_behind():
+    cache = _cache()
+    before = set(_OPTION_SCALES)
+    broken = _document("phq9")
+    broken["detail"]["questions"][0]["options"][0]["text"] = "A scale only this document has"
+    broken["detail"]["safety_rules"] = [{"flag": "self_harm", "question": 99, "min_value": 1}]
+    await cache.apply({"phq9": broken})
+    assert "phq9" in cache._rejected
+    assert set(_OPTION_SCALES) == before
+
+
+class _ChangeStream:
+    def __init__(self, changes):
+        self._changes = changes
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def __aiter__(self):
+        for change in self._changes:
+            yield change
+
+
+class _Collection:
+    """A mongomock-motor collection with change streams scripted (changes) or unsupported (None)"""
+
+    def __init__(self, collection, changes=None):
+        self._collection = collection
+        self._changes = changes
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+    def watch(self, *args, **kwargs):
+        if self._changes is None:
+            raise OperationFailure("The $changeStream stage is only supported on replica sets", code=40573)
+        return _ChangeStream(self._changes)
+
+
+class _StandaloneMongo:
+    """MongoManager stand-in whose server has no change streams, so the cache polls"""
+
+    def __init__(self, database):
+        self.database = database
+
+    async def get_database(self):
+        return {CATALOG_COLLECTION: _Collection(self.database[CATALOG_COLLECTION])}
+
+
+async def test_seed_fills_only_an_empty_collection(mock_mongo):
+    collection = mock_mongo.database[CATALOG_COLLECTION]
+    cache = _cache()
+    await cache.seed(collection)
+    assert await collection.count_documents({}) == len(server._ASSESSMENT_SUMMARIES)
+
+    await collection.delete_one({"_id": "mbti"})
+    await cache.seed(collection)
+    assert await collection.count_documents({}) == len(server._ASSESSMENT_SUMMARIES) - 1
+
+
+async def test_reload_rebuilds_only_changed_documents(mock_mongo):
+    collection = mock_mongo.database[CATALOG_COLLECTION]
+    cache = _cache()
+    await cache.seed(collection)
+    before = cache.snapshot
+
+    await cache.reload(collection)
+    assert cache.snapshot is before
+
+    await collection.update_one({"_id": "phq9"}, {"$set": {"summary.name": "Edited"}})
+    await cache.reload(collection)
+    assert cache.snapshot.entries["phq9"].summary["name"] == "Edited"
+    assert cache.snapshot.entries["gad7"] is before.entries["gad7"]
+    assert server._ASSESSMENT_SUMMARIES[0]["name"] != "Edited"
+
+
+async def test_entries_are_built_off_the_event_loop(mock_mongo, monkeypatch):
+    collection = mock_mongo.database[CATALOG_COLLECTION]
+    cache = _cache()
+    await cache.seed(collection)
+    build = CatalogEntry.from_document
+    threads = []
+
+    def recording_build(document):
+        threads.append(threading.current_thread())
+        return build(document)
+
+    monkeypatch.setattr(CatalogEntry, "from_document", recording_build)
+    await collection.update_many({}, {"$inc": {"position": 100}})
+    await cache.reload(collection)
+    assert len(threads) == len(server._ASSESSMENT_SUMMARIES)
+    assert threading.main_thread() not in threads
+    assert all(entry.position >= 100 for entry in cache.snapshot.entries.values())
+
+
+async def test_invalid_edit_keeps_the_last_good_entry(mock_mongo, caplog):
+    collection = mock_mongo.database[CATALOG_COLLECTION]
+    cache = _cache()
+    await cache.seed(collection)
+    entry = cache.snapshot.entries["phq9"]
+
+    # Leaves scores 0-4 without a band
+    await collection.update_one({"_id": "phq9"}, {"$unset": {"detail.interpretation.0-4": ""}})
+    with caplog.at_level(logging.ERROR, logger="catalog_store"):
+        await cache.reload(collection)
+    assert cache.snapshot.entries["phq9"] is entry
+    assert "Ignoring invalid catalog document 'phq9'" in caplog.text
+
+    # The same broken document is not rebuilt (or logged) on every poll
+    caplog.clear()
+    with caplog.at_level(logging.ERROR, logger="catalog_store"):
+        await cache.reload(collection)
+    assert caplog.text == ""
+
+
+async def test_deleted_document_leaves_the_catalog(mock_mongo):
+    collection = mock_mongo.database[CATALOG_COLLECTION]
+    cache = _cache()
+    await cache.seed(collection)
+
+    await collection.delete_one({"_id": "gad7"})
+    await cache.reload(collection)
+    assert "gad7" not in cache.snapshot.ids
+    assert "phq9" in cache.snapshot.ids
+
+
+async def test_empty_collection_keeps_the_current_catalog(mock_mongo):
+    cache = _cache()
+    before = cache.snapshot
+    await cache.reload(mock_mongo.database[CATALOG_COLLECTION])
+    assert cache.snapshot is before
+
+
+async def test_change_stream_events_are_applied(mock_mongo):
+    collection = mock_mongo.database[CATALOG_COLLECTION]
+    cache = _cache()
+    await cache.seed(collection)
+
+    edited = _document("phq9")
+    edited["summary"]["name"] = "Edited"
+    added = _document("gad7")
+    added["_id"] = added["summary"]["id"] = added["detail"]["id"] = "gad7_copy"
+    changes = [
+        {"operationType": "replace", "fullDocument": edited},
+        {"operationType": "insert", "fullDocument": added},
+        {"operationType": "delete", "documentKey": {"_id": "gad7"}},
+        {"operationType": "invalidate"},
+        {"operationType": "delete", "documentKey": {"_id": "phq9"}},
+    ]
+    await cache._watch(_Collection(collection, changes))
+
+    assert cache.snapshot.entries["phq9"].summary["name"] == "Edited"
+    assert "gad7_copy" in cache.snapshot.ids
+    assert "gad7" not in cache.snapshot.ids
+    # Events after an invalidate are left for the reopened stream
+    assert "phq9" in cache.snapshot.ids
+
+
+async def test_polling_sync_survives_bad_documents_and_unexpected_errors(mock_mongo, monkeypatch, caplog):
+    monkeypatch.setattr(catalog_store, "CATALOG_POLL_SECONDS", 0.01)
+    collection = mock_mongo.database[CATALOG_COLLECTION]
+    cache = _cache()
+
+    reload = cache.reload
+    failures = []
+
+    async def flaky_reload(target):
+        if not failures:
+            failures.append(target)
+            raise RuntimeError("unexpected")
+        await reload(target)
+
+    cache.reload = flaky_reload
+    cache.start(_StandaloneMongo(mock_mongo.database))
+    try:
+        async def seeded():
+            return await collection.count_documents({}) == len(server._ASSESSMENT_SUMMARIES)
+
+        await _eventually(seeded)
+
+        # A double where an int belongs must not take the sync task down with it
+        await collection.update_one({"_id": "phq9"}, {"$set": {"detail.questions.0.options.3.value": 4.0}})
+
+        async def rejected():
+            return "phq9" in cache._rejected
+
+        await _eventually(rejected)
+
+        await collection.update_one({"_id": "gad7"}, {"$set": {"summary.name": "Still syncing"}})
+
+        async def synced():
+            return cache.snapshot.entries["gad7"].summary["name"] == "Still syncing"
+
+        await _eventually(synced)
+    finally:
+        await cache.stop()
+
+    assert failures
+    assert "Catalog sync failed unexpectedly" in caplog.text
+    assert cache._task is None
+
+
+async def test_stop_tolerates_a_failed_sync_task():
+    cache = _cache()
+
+    async def crashed():
+        raise RuntimeError("boom")
+
+    cache._task = asyncio.create_task(crashed())
+    await asyncio.sleep(0)
+    await cache.stop()
+    assert cache._task is None
@@ -0,0 +1,129 @@
+import threading
+
+import pytest
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+import completion_counts
+from completion_counts import COMPLETION_COLLECTION, CompletionCounters
+
+pytestmark = pytest.mark.anyio
+
+
+async def _counts(collection) -> dict:
+    return {
+        (document["_id"]["assessment_id"], document["_id"]["band"]): document["count"]
+        async for document in collection.find()
+    }
+
+
+class _FlakyCollection:
+    """Fails the upserts for some assessments (by BulkWriteError) or every upsert (by a PyMongoError)"""
+
+    def __init__(self, collection, failing=(), fail_all=False):
+        self._collection = collection
+        self.failing = set(failing)
+        self.fail_all = fail_all
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+    async def bulk_write(self, operations, ordered=True):
+        if self.fail_all:
+            raise AutoReconnect("connection lost")
+        failed = [index for index, operation in enumerate(operations)
+                  if operation._filter["_id"]["assessment_id"] in self.failing]
+        applied = [operation for index, operation in enumerate(operations) if index not in failed]
+        if applied:
+            await self._collection.bulk_write(applied, ordered=ordered)
+        if failed:
+            raise BulkWriteError({
+                "writeErrors": [{"index": index, "code": 11000, "errmsg": "E11000 duplicate key"} for index in failed],
+            })
+
+
+async def test_flush_sends_what_was_retired_on_the_previous_round(mock_mongo):
+    collection = mock_mongo.database[COMPLETION_COLLECTION]
+    counters = CompletionCounters(enabled=True)
+    counters.record("phq9", "Mild")
+    counters.record("phq9", "Mild")
+
+    # The first round only retires the active counts, so increments racing the swap still land
+    assert await counters.flush(collection) == 0
+    counters.record("gad7", "Minimal")
+    assert await counters.flush(collection) == 1
+    assert await _counts(collection) == {("phq9", "Mild"): 2}
+
+    assert await counters.flush(collection) == 1
+    assert await counters.flush(collection) == 0
+    assert await _counts(collection) == {("phq9", "Mild"): 2, ("gad7", "Minimal"): 1}
+
+
+async def test_each_thread_counts_into_its_own_shard(mock_mongo):
+    collection = mock_mongo.database[COMPLETION_COLLECTION]
+    counters = CompletionCounters(enabled=True)
+    counters.record("phq9", "Mild")
+    worker = threading.Thread(target=counters.record_many, args=("phq9", {"Mild": 3, "Severe": 1}))
+    worker.start()
+    worker.join()
+
+    assert len(counters._shards) == 2
+    assert await counters.flush(collection, final=True) == 2
+    assert await _counts(collection) == {("phq9", "Mild"): 4, ("phq9", "Severe"): 1}
+
+
+async def test_partial_bulk_write_failure_retries_only_the_failed_upserts(mock_mongo):
+    flaky = _FlakyCollection(mock_mongo.database[COMPLETION_COLLECTION], failing={"gad7"})
+    counters = CompletionCounters(enabled=True)
+    counters.record_many("phq9", {"Mild": 2})
+    counters.record_many("gad7", {"Minimal": 5})
+
+    assert await counters.flush(flaky, final=True) == 1
+    assert await _counts(flaky) == {("phq9", "Mild"): 2}
+
+    # The failed counts are kept, and merged with anything recorded since
+    counters.record("gad7", "Minimal")
+    flaky.failing.clear()
+    assert await counters.flush(flaky, final=True) == 1
+    assert await _counts(flaky) == {("phq9", "Mild"): 2, ("gad7", "Minimal"): 6}
+
+
+async def test_failed_flush_keeps_every_count(mock_mongo):
+    flaky = _FlakyCollection(mock_mongo.database[COMPLETION_COLLECTION], fail_all=True)
+    counters = CompletionCounters(enabled=True)
+    counters.record("phq9", "Mild")
+
+    assert await counters.flush(flaky, final=True) == 0
+    flaky.fail_all = False
+    assert await counters.flush(flaky, final=True) == 1
+    assert await _counts(flaky) == {("phq9", "Mild"): 1}
+
+
+async def test_stop_flushes_everything_pending(mock_mongo, monkeypatch):
+    monkeypatch.setattr(completion_counts, "COMPLETION_FLUSH_SECONDS", 3600)
+    counters = CompletionCounters(enabled=True)
+    counters.start(mock_mongo)
+    counters.record("phq9", "Mild")
+    counters.record("mbti", "INTJ")
+    await counters.stop(mock_mongo)
+
+    assert counters._task is None
+    assert await _counts(mock_mongo.database[COMPLETION_COLLECTION]) == {("phq9", "Mild"): 1, ("mbti", "INTJ"): 1}
+
+
+async def test_stop_gives_up_on_an_unreachable_database(caplog):
+    class _Unreachable:
+        async def get_database(self):
+            raise AutoReconnect("no servers")
+
+    counters = CompletionCounters(enabled=True)
+    counters.start(_Unreachable())
+    counters.record("phq9", "Mild")
+    await counters.stop(_Unreachable())
+    assert "Dropping unflushed completion counts at shutdown" in caplog.text
+
+
+def test_disabled_counters_record_nothing():
+    counters = CompletionCounters(enabled=False)
+    counters.record("phq9", "Mild")
+    counters.record_many("phq9", {"Mild": 2})
+    assert counters._shards == []
@@ -0,0 +1,25 @@
+import gzip
+import json
+
+import server
+from export_static import export
+from payloads import brotli
+
+
+def test_every_file_gets_compressed_siblings_that_decode_to_it(tmp_path):
+    manifest = export(server.catalog.snapshot, tmp_path)
+    codings = {"gzip": (".gz", gzip.decompress)}
+    if brotli is not None:
+        codings["br"] = (".br", brotli.decompress)
+
+    for relative_path, described in manifest["files"].items():
+        path = tmp_path / relative_path
+        assert path.stat().st_size == described["bytes"]
+        if relative_path == "api/index.json":
+            # Too small for compression to pay off
+            continue
+        assert set(described["encodings"]) == set(codings), relative_path
+        for suffix, decompress in codings.values():
+            assert decompress(path.with_name(path.name + suffix).read_bytes()) == path.read_bytes()
+
+    assert json.loads((tmp_path / "manifest.json").read_text()) == manifest
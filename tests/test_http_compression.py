@@ -0,0 +1,156 @@
+import gzip
+import json
+import zlib
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+import server
+from http_compression import COMPRESS_MIN_SIZE, CompressionMiddleware, _StreamCompressor
+from payloads import brotli, choose_encoding
+
+pytestmark = pytest.mark.anyio
+
+needs_brotli = pytest.mark.skipif(brotli is None, reason="brotli is not installed")
+
+LARGE = {"values": list(range(COMPRESS_MIN_SIZE))}
+LINES = [{"line": index, "padding": "x" * 40} for index in range(20)]
+
+
+async def _stream():
+    for line in LINES:
+        yield json.dumps(line).encode() + b"\n"
+
+
+def _app():
+    async def sized(request):
+        return Response(b"a" * int(request.path_params["size"]), media_type="application/json")
+
+    async def large(request):
+        return JSONResponse(LARGE)
+
+    async def tagged(request):
+        return JSONResponse(LARGE, headers={"ETag": '"abc"'})
+
+    async def image(request):
+        return Response(b"\x89PNG" + b"\0" * 2048, media_type="image/png")
+
+    async def stream(request):
+        return StreamingResponse(_stream(), media_type="application/x-ndjson")
+
+    routes = [
+        Route("/sized/{size:int}", sized),
+        Route("/large", large),
+        Route("/tagged", tagged),
+        Route("/image", image),
+        Route("/stream", stream),
+    ]
+    return CompressionMiddleware(Starlette(routes=routes))
+
+
+def _decode(coding: str, body: bytes) -> bytes:
+    if coding == "br":
+        return brotli.decompress(body)
+    if coding == "gzip":
+        return gzip.decompress(body)
+    return body
+
+
+async def _get(app, path: str, accept_encoding: str = None):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        # httpx sends its own Accept-Encoding unless told otherwise
+        del client.headers["Accept-Encoding"]
+        headers = {"Accept-Encoding": accept_encoding} if accept_encoding is not None else {}
+        async with client.stream("GET", path, headers=headers) as response:
+            raw = b"".join([chunk async for chunk in response.aiter_raw()])
+    return response, raw
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip", "gzip"),
+        ("gzip, deflate", "gzip"),
+        pytest.param("gzip, br", "br", marks=needs_brotli),
+        pytest.param("br;q=0.5, gzip;q=0.8", "gzip", marks=needs_brotli),
+        pytest.param("*", "br", marks=needs_brotli),
+        ("br;q=0, gzip", "gzip"),
+        ("gzip;q=0", None),
+        ("identity", None),
+        ("", None),
+    ],
+)
+async def test_negotiates_the_best_accepted_coding(accept_encoding, expected):
+    response, raw = await _get(_app(), "/large", accept_encoding)
+    assert response.headers.get("Content-Encoding") == expected
+    assert json.loads(_decode(expected, raw)) == LARGE
+    if expected:
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert int(response.headers["Content-Length"]) == len(raw)
+
+
+async def test_without_accept_encoding_nothing_is_compressed():
+    response, raw = await _get(_app(), "/large")
+    assert "Content-Encoding" not in response.headers
+    assert json.loads(raw) == LARGE
+
+
+@pytest.mark.parametrize("size, compressed", [(COMPRESS_MIN_SIZE - 1, False), (COMPRESS_MIN_SIZE, True)])
+async def test_bodies_below_the_threshold_are_sent_as_is(size, compressed):
+    response, raw = await _get(_app(), f"/sized/{size}", "gzip")
+    assert ("Content-Encoding" in response.headers) is compressed
+    assert _decode("gzip" if compressed else None, raw) == b"a" * size
+
+
+async def test_responses_with_an_etag_are_left_alone():
+    response, raw = await _get(_app(), "/tagged", "gzip")
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["ETag"] == '"abc"'
+    assert json.loads(raw) == LARGE
+
+
+async def test_other_content_types_are_left_alone():
+    response, raw = await _get(_app(), "/image", "gzip")
+    assert "Content-Encoding" not in response.headers
+    assert raw.startswith(b"\x89PNG")
+
+
+@pytest.mark.parametrize("coding", ["gzip", pytest.param("br", marks=needs_brotli)])
+async def test_streamed_ndjson_decodes_line_for_line(coding):
+    response, raw = await _get(_app(), "/stream", coding)
+    assert response.headers["Content-Encoding"] == coding
+    assert "Content-Length" not in response.headers
+    assert [json.loads(line) for line in _decode(coding, raw).splitlines()] == LINES
+
+
+@pytest.mark.parametrize("coding", ["gzip", pytest.param("br", marks=needs_brotli)])
+def test_every_stream_chunk_decodes_on_arrival(coding):
+    compressor = _StreamCompressor(coding)
+    decoder = brotli.Decompressor() if coding == "br" else zlib.decompressobj(31)
+    decode = decoder.process if coding == "br" else decoder.decompress
+    for line in LINES:
+        data = json.dumps(line).encode() + b"\n"
+        # Flushed per chunk, so a client sees each NDJSON line without waiting for the next
+        assert decode(compressor.chunk(data)) == data
+    assert decode(compressor.finish()) == b""
+
+
+async def test_batch_scores_stream_compressed_from_the_api():
+    responses = {"phq9": [[0] * 9, [1] * 9, [3] * 9], "gad7": [[2] * 7]}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://test") as client:
+        async with client.stream(
+            "POST", "/api/score/batch", json={"responses": responses}, headers={"Accept-Encoding": "gzip"}
+        ) as response:
+            raw = b"".join([chunk async for chunk in response.aiter_raw()])
+    assert response.headers["Content-Encoding"] == "gzip"
+    results = [json.loads(line) for line in gzip.decompress(raw).splitlines()]
+    assert {result["assessment_id"]: result["scores"] for result in results} == {"phq9": [0, 9, 27], "gad7": [14]}
+
+
+def test_choose_encoding_prefers_earlier_codings_on_ties():
+    assert choose_encoding("gzip, br", ["br", "gzip"]) == "br"
+    assert choose_encoding("gzip, br", ["gzip", "br"]) == "gzip"
+    assert choose_encoding("deflate", ["br", "gzip"]) is None
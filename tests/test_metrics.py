@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+from metrics import MetricsDirectory, RequestMetrics, retire_worker
+
+pytestmark = pytest.mark.anyio
+
+DETAIL = ("GET", "/api/assessment/{assessment_id}")
+SCORE = ("POST", "/api/assessment/{assessment_id}/score")
+
+
+def _metrics(*requests) -> RequestMetrics:
+    metrics = RequestMetrics()
+    for key, status, seconds, size in requests:
+        metrics.started(key)
+        metrics.finished(key, status, seconds, size)
+    return metrics
+
+
+def _series(text: str, prefix: str) -> list:
+    return [line for line in text.splitlines() if line.startswith(prefix)]
+
+
+def test_state_round_trip_renders_the_same():
+    metrics = _metrics((DETAIL, 200, 0.002, 3000), (DETAIL, 304, 0.0004, 0), (SCORE, 422, 0.01, 120))
+    metrics.started(SCORE)
+    copy = RequestMetrics()
+    copy.add_state(metrics.to_state())
+    assert copy.render() == metrics.render()
+
+
+def test_directory_sums_every_worker(tmp_path):
+    first = MetricsDirectory(str(tmp_path), _metrics((DETAIL, 200, 0.002, 3000), (SCORE, 200, 0.01, 400)))
+    second = MetricsDirectory(str(tmp_path), _metrics((DETAIL, 200, 0.3, 3000), (DETAIL, 404, 0.001, 50)))
+    second.write()
+
+    text = first.render()
+    assert _series(text, "http_requests_total{") == [
+        'http_requests_total{method="GET",route="/api/assessment/{assessment_id}",status="200"} 2',
+        'http_requests_total{method="GET",route="/api/assessment/{assessment_id}",status="404"} 1',
+        'http_requests_total{method="POST",route="/api/assessment/{assessment_id}/score",status="200"} 1',
+    ]
+    detail_durations = 'http_request_duration_seconds_bucket{method="GET",route="/api/assessment/{assessment_id}",'
+    assert f'{detail_durations}le="0.0025"}} 2' in text
+    assert f'{detail_durations}le="0.5"}} 3' in text
+    assert 'http_response_size_bytes_sum{method="GET",route="/api/assessment/{assessment_id}"} 6050.0' in text
+
+    # Whichever worker answers the scrape, the totals are the same
+    assert second.render() == text
+
+
+def test_scrapes_see_the_answering_worker_live(tmp_path):
+    metrics = _metrics((DETAIL, 200, 0.002, 3000))
+    directory = MetricsDirectory(str(tmp_path), metrics)
+    directory.write()
+    metrics.started(DETAIL)
+    metrics.finished(DETAIL, 200, 0.002, 3000)
+    assert 'status="200"} 2' in directory.render()
+
+
+def test_retired_workers_keep_their_counts_but_not_their_in_progress(tmp_path, monkeypatch):
+    live = MetricsDirectory(str(tmp_path), _metrics((DETAIL, 200, 0.002, 3000)))
+    exited_metrics = _metrics((DETAIL, 200, 0.002, 3000))
+    exited_metrics.started(SCORE)
+    with monkeypatch.context() as patch:
+        patch.setattr(os, "getpid", lambda: 4242)
+        MetricsDirectory(str(tmp_path), exited_metrics).write()
+
+    assert 'http_requests_in_progress{method="POST",route="/api/assessment/{assessment_id}/score"} 1' in live.render()
+    retire_worker(str(tmp_path), 4242)
+    text = live.render()
+    assert 'status="200"} 2' in text
+    assert 'route="/api/assessment/{assessment_id}/score"} 1' not in text
+
+
+async def test_stop_writes_the_final_counts(tmp_path, monkeypatch):
+    monkeypatch.setattr("metrics.METRICS_WRITE_SECONDS", 3600)
+    metrics = RequestMetrics()
+    directory = MetricsDirectory(str(tmp_path), metrics)
+    directory.start()
+    metrics.started(DETAIL)
+    metrics.finished(DETAIL, 200, 0.002, 3000)
+    await directory.stop()
+
+    reader = MetricsDirectory(str(tmp_path), RequestMetrics())
+    assert 'status="200"} 1' in reader.render()
@@ -0,0 +1,111 @@
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from payloads import CATALOG_CACHE_CONTROL, EncodedPayload, _if_none_match_tags, brotli
+
+pytestmark = pytest.mark.anyio
+
+CONTENT = {"questions": [{"id": index, "text": "How often?" * 10} for index in range(20)]}
+PAYLOAD = EncodedPayload.from_content(CONTENT)
+
+
+@pytest.mark.parametrize(
+    "header, tags",
+    [
+        ('"abc"', ['"abc"']),
+        ('W/"abc"', ['"abc"']),
+        (' "abc" , W/"def",,"ghi-gzip" ', ['"abc"', '"def"', '"ghi-gzip"']),
+        ("*", ["*"]),
+        ("", []),
+    ],
+)
+def test_if_none_match_tags(header, tags):
+    assert _if_none_match_tags(header) == tags
+
+
+def test_etags_share_the_digest_across_codings():
+    assert PAYLOAD.etag() == f'"{PAYLOAD.digest}"'
+    assert PAYLOAD.etag("gzip") == f'"{PAYLOAD.digest}-gzip"'
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        PAYLOAD.etag(),
+        PAYLOAD.etag("gzip"),
+        PAYLOAD.etag("br"),
+        f"W/{PAYLOAD.etag('gzip')}",
+        f'"0123", {PAYLOAD.etag("br")}',
+        "*",
+    ],
+    ids=["identity", "gzip", "br", "weak", "list", "wildcard"],
+)
+def test_matches_any_coding_of_the_same_content(header):
+    assert PAYLOAD.matches(header)
+
+
+@pytest.mark.parametrize("header", ['"0123"', '"0123-gzip"', f'"{PAYLOAD.digest[:-1]}"', f'"x{PAYLOAD.digest}"', ""])
+def test_other_content_does_not_match(header):
+    assert not PAYLOAD.matches(header)
+
+
+def test_other_content_has_another_digest():
+    other = EncodedPayload.from_content({**CONTENT, "extra": True})
+    assert other.digest != PAYLOAD.digest
+    assert not other.matches(PAYLOAD.etag("gzip"))
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/payload")
+    async def payload(request: Request):
+        return PAYLOAD.response(request)
+
+    return app
+
+
+async def _get(headers: dict) -> httpx.Response:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=_app()), base_url="http://test") as client:
+        # httpx sends its own Accept-Encoding unless told otherwise
+        del client.headers["Accept-Encoding"]
+        return await client.get("/payload", headers=headers)
+
+
+async def test_response_sends_the_negotiated_variant():
+    response = await _get({"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["ETag"] == PAYLOAD.etag("gzip")
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["Cache-Control"] == CATALOG_CACHE_CONTROL
+    # Decoded by httpx
+    assert response.content == PAYLOAD.identity
+
+    plain = await _get({})
+    assert "Content-Encoding" not in plain.headers
+    assert plain.headers["ETag"] == PAYLOAD.etag()
+    assert plain.content == PAYLOAD.identity
+
+
+@pytest.mark.parametrize("accept_encoding, coding", [("gzip", "gzip"), ("identity", None)])
+async def test_not_modified_has_no_body(accept_encoding, coding):
+    # Revalidating with the tag of another coding still gets a 304, tagged for the coding negotiated now
+    response = await _get({"Accept-Encoding": accept_encoding, "If-None-Match": f'W/"{PAYLOAD.digest}-br"'})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["ETag"] == PAYLOAD.etag(coding)
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["Cache-Control"] == CATALOG_CACHE_CONTROL
+
+
+@pytest.mark.skipif(brotli is None, reason="brotli is not installed")
+def test_deferred_brotli_keeps_the_digest_and_comes_first():
+    deferred = EncodedPayload.from_content(CONTENT, brotli_quality=None)
+    assert list(deferred.variants) == ["gzip"]
+    deferred.add_brotli()
+    assert list(deferred.variants) == ["br", "gzip"]
+    assert brotli.decompress(deferred.variants["br"]) == deferred.identity
+    assert deferred.digest == PAYLOAD.digest
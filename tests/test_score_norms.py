@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+import server
+from catalog_store import CatalogSnapshot
+from score_norms import NORMS_COLLECTION, NormTable, ScoreNorms
+
+pytestmark = pytest.mark.anyio
+
+
+def _phq9_counts(**counts) -> list:
+    """28 counts for PHQ-9 scores 0-27, zero except the given score_<n>=count"""
+    values = [0] * 28
+    for key, count in counts.items():
+        values[int(key.removeprefix("score_"))] = count
+    return values
+
+
+def _scorer(assessment_id: str = "phq9"):
+    return server.catalog.snapshot.entries[assessment_id].scorer
+
+
+def test_norm_table_uses_mid_rank_percentiles():
+    table = NormTable.from_document({"_id": "phq9", "counts": _phq9_counts(score_0=2, score_1=1, score_5=1)}, _scorer())
+    assert table.sample_size == 4
+    # Below plus half of those tied, over the sample: 0 -> (0 + 1) / 4, 1 -> (2 + 0.5) / 4, 5 -> (3 + 0.5) / 4
+    assert table.lookup(0) == 25.0
+    assert table.lookup(1) == 62.5
+    assert table.lookup(2) == 75.0
+    assert table.lookup(5) == 87.5
+    assert table.lookup(27) == 100.0
+    assert table.lookup_many(np.array([0, 5, 27])) == [25.0, 87.5, 100.0]
+
+
+def test_norm_table_rounds_to_one_decimal():
+    table = NormTable.from_document({"_id": "phq9", "counts": _phq9_counts(score_0=1, score_1=1, score_2=1)}, _scorer())
+    assert table.lookup(0) == 16.7
+    assert table.lookup(1) == 50.0
+    assert table.lookup(2) == 83.3
+
+
+@pytest.mark.parametrize(
+    "counts",
+    [
+        [1] * 27,
+        [1] * 29,
+        [1] * 27 + [-1],
+        [1] * 27 + [1.5],
+        [1] * 27 + [True],
+        [0] * 28,
+        "1,2,3",
+    ],
+)
+def test_norm_table_rejects_counts_that_do_not_fit_the_score_range(counts):
+    with pytest.raises(ValueError):
+        NormTable.from_document({"_id": "phq9", "counts": counts}, _scorer())
+
+
+def test_invalid_and_non_summed_norms_are_ignored():
+    norms = ScoreNorms(server.catalog)
+    norms.apply(
+        {"phq9": {"_id": "phq9", "counts": [1] * 3}, "mbti": {"_id": "mbti", "counts": [1] * 3}},
+        server.catalog.snapshot,
+    )
+    assert dict(norms.tables) == {}
+    assert norms.percentile(_scorer(), 3) is None
+
+
+def test_deleted_norms_are_dropped():
+    norms = ScoreNorms(server.catalog)
+    snapshot = server.catalog.snapshot
+    phq9 = {"_id": "phq9", "counts": _phq9_counts(score_0=1)}
+    gad7 = {"_id": "gad7", "counts": [1] * 22}
+    norms.apply({"phq9": phq9, "gad7": gad7}, snapshot)
+    assert set(norms.tables) == {"phq9", "gad7"}
+
+    norms.apply({"gad7": gad7}, snapshot)
+    assert set(norms.tables) == {"gad7"}
+    assert norms.percentile(_scorer(), 0) is None
+
+
+def test_norms_deleted_as_the_catalog_changes_are_not_served():
+    norms = ScoreNorms(server.catalog)
+    snapshot = server.catalog.snapshot
+    norms.apply({"phq9": {"_id": "phq9", "counts": _phq9_counts(score_0=1)}}, snapshot)
+    assert norms.percentile(_scorer(), 0) == 50.0
+
+    # The next poll sees a new snapshot and no document: the old table must not survive the rebuild
+    norms.apply({}, CatalogSnapshot.from_entries(dict(snapshot.entries)))
+    assert dict(norms.tables) == {}
+    assert norms.percentile(_scorer(), 0) is None
+
+
+async def test_reload_reads_the_norms_collection(mock_mongo):
+    collection = mock_mongo.database[NORMS_COLLECTION]
+    await collection.insert_one({"_id": "phq9", "counts": _phq9_counts(score_0=1, score_27=1)})
+    norms = ScoreNorms(server.catalog)
+    await norms.reload(collection)
+    assert norms.percentile(_scorer(), 0) == 25.0
+    assert norms.percentiles(_scorer(), np.array([0, 27])) == [25.0, 75.0]
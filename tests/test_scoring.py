@@ -0,0 +1,278 @@
+import copy
+import itertools
+
+import numpy as np
+import pytest
+
+from catalog_store import CatalogEntry
+from scoring import ScoringError
+
+SUMMARY = {
+    "id": "synthetic",
+    "name": "Synthetic Scale",
+    "short_name": "SYN",
+    "description": "Test instrument",
+    "duration": "1 min",
+    "image": "",
+}
+
+
+def _band(level: str) -> dict:
+    return {"level": level, "description": level, "color": "#000000"}
+
+
+def _options(*values: int) -> list:
+    return [{"text": str(value), "value": value} for value in values]
+
+
+# q1 plain, q2 reverse, q3 weight 2, q4 reverse with weight 2 on a 1-4 scale:
+# total = q1 + (3 - q2) + 2 * q3 + 2 * (5 - q4), from 2 to 20
+DETAIL = {
+    "id": "synthetic",
+    "name": "Synthetic Scale",
+    "description": "Test instrument",
+    "questions": [
+        {"id": 1, "text": "Plain", "options": _options(0, 1, 2, 3)},
+        {"id": 2, "text": "Reversed", "options": _options(0, 1, 2, 3), "reverse": True},
+        {"id": 3, "text": "Doubled", "options": _options(0, 1, 2, 3), "weight": 2},
+        {"id": 4, "text": "Reversed and doubled", "options": _options(1, 2, 3, 4), "weight": 2, "reverse": True},
+    ],
+    "interpretation": {"2-9": _band("Low"), "10-20": _band("High")},
+    "subscales": {
+        # 2 * (q1 + (3 - q2)), from 0 to 12
+        "pair": {"name": "Pair", "questions": [1, 2], "multiplier": 2,
+                 "interpretation": {"0-5": _band("Pair low"), "6-12": _band("Pair high")}},
+        # 2 * (5 - q4), from 2 to 8
+        "last": {"name": "Last", "questions": [4], "interpretation": {"2-8": _band("Last")}},
+    },
+    "safety_rules": [{"flag": "first_high", "question": 1, "min_value": 3}],
+}
+
+
+def _scorer(detail=DETAIL):
+    return CatalogEntry.build(0, SUMMARY, copy.deepcopy(detail)).scorer
+
+
+def test_weights_compile_reverse_keying_weights_and_multipliers():
+    scorer = _scorer()
+    assert scorer.weight_rows == ((1, -1, 2, -2), (2, -2, 0, 0), (0, 0, 0, -2))
+    # Reverse keying adds weight * (lowest + highest) per reversed item: 1 * (0 + 3) and 2 * (1 + 4)
+    assert scorer.offset_values == (13, 6, 10)
+    assert (scorer.bands.min_score, scorer.max_score) == (2, 20)
+    assert [(key, max_score, bands.min_score) for key, _, max_score, bands in scorer.subscales] == [
+        ("pair", 12, 0),
+        ("last", 8, 2),
+    ]
+
+
+def test_reverse_keyed_answers_count_from_the_other_end():
+    scorer = _scorer()
+    lowest = scorer.score([0, 3, 0, 4])
+    assert lowest["score"] == 2
+    assert lowest["interpretation"]["level"] == "Low"
+    assert lowest["subscales"]["pair"]["score"] == 0
+    assert lowest["subscales"]["last"]["score"] == 2
+
+    highest = scorer.score([3, 0, 3, 1])
+    assert highest["score"] == 20
+    assert highest["interpretation"]["level"] == "High"
+    assert highest["subscales"]["pair"] == {
+        "name": "Pair",
+        "score": 12,
+        "max_score": 12,
+        "interpretation": {**_band("Pair high"), "min": 6, "max": 12},
+    }
+    assert highest["subscales"]["last"]["score"] == 8
+
+
+def test_weights_and_multipliers_scale_each_answer():
+    scorer = _scorer()
+    base = scorer.score([0, 3, 0, 4])
+    # q3 counts twice in the total and not at all in the subscales
+    assert scorer.score([0, 3, 1, 4])["score"] == base["score"] + 2
+    # q1 counts once in the total and, times the multiplier, twice in "pair"
+    bumped = scorer.score([1, 3, 0, 4])
+    assert bumped["score"] == base["score"] + 1
+    assert bumped["subscales"]["pair"]["score"] == base["subscales"]["pair"]["score"] + 2
+
+
+def test_safety_rules_flag_single_answers():
+    scorer = _scorer()
+    assert scorer.score([3, 3, 0, 4])["flags"] == ["first_high"]
+    assert scorer.score([2, 3, 0, 4])["flags"] == []
+
+
+@pytest.mark.parametrize(
+    "interpretation",
+    [
+        {"0-5": _band("Low"), "6-11": _band("High")},
+        {"0-5": _band("Low"), "6-13": _band("High")},
+        {"1-5": _band("Low"), "6-12": _band("High")},
+        {"0-5": _band("Low"), "7-12": _band("High")},
+        {"0-6": _band("Low"), "6-12": _band("High")},
+    ],
+    ids=["short", "long", "late start", "gap", "overlap"],
+)
+def test_subscale_bands_must_tile_the_subscale_range(interpretation):
+    detail = copy.deepcopy(DETAIL)
+    detail["subscales"]["pair"]["interpretation"] = interpretation
+    with pytest.raises(ValueError, match="synthetic/pair"):
+        _scorer(detail)
+
+
+@pytest.mark.parametrize("questions", [[], [1, 1], [5], [0]])
+def test_subscales_need_distinct_known_questions(questions):
+    detail = copy.deepcopy(DETAIL)
+    detail["subscales"]["pair"]["questions"] = questions
+    with pytest.raises(ValueError, match="subscale 'pair'"):
+        _scorer(detail)
+
+
+@pytest.mark.parametrize(
+    "misspell",
+    [
+        lambda detail: detail["questions"][1].update(revrse=True),
+        lambda detail: detail["questions"][2].update(weigth=2),
+        lambda detail: detail["questions"][0]["options"][0].update(valeu=0),
+        lambda detail: detail["subscales"]["pair"].update(multiplyer=3),
+        lambda detail: detail["safety_rules"][0].update(min=2),
+        lambda detail: detail.update(safety_rule=[]),
+    ],
+    ids=["reverse", "weight", "option", "multiplier", "safety rule", "top level"],
+)
+def test_misspelled_keys_are_rejected(misspell):
+    detail = copy.deepcopy(DETAIL)
+    misspell(detail)
+    with pytest.raises(ValueError, match="Extra inputs are not permitted"):
+        _scorer(detail)
+
+
+def test_single_answers_are_validated():
+    scorer = _scorer()
+    with pytest.raises(ScoringError):
+        scorer.score([0, 0, 0])
+    with pytest.raises(ScoringError):
+        scorer.score([0, 0, 0, 0])
+
+
+def test_batch_scores_match_single_scores():
+    scorer = _scorer()
+    rows = [list(answers) for answers in itertools.product(*(sorted(values) for values in scorer.allowed_values))]
+    batch = scorer.score_matrix(scorer.to_matrix(rows))
+    singles = [scorer.score(row) for row in rows]
+
+    assert batch["count"] == len(rows)
+    assert batch["scores"] == [single["score"] for single in singles]
+    assert [batch["interpretation"][band] for band in batch["bands"]] == [single["interpretation"] for single in singles]
+    for key, subscale in batch["subscales"].items():
+        assert subscale["scores"] == [single["subscales"][key]["score"] for single in singles]
+        assert [subscale["interpretation"][band] for band in subscale["bands"]] == [
+            single["subscales"][key]["interpretation"] for single in singles
+        ]
+    flagged = [index for index, single in enumerate(singles) if single["flags"]]
+    assert batch["flags"] == {"first_high": flagged}
+
+
+def test_batch_rejects_answers_that_are_not_options():
+    scorer = _scorer()
+    with pytest.raises(ScoringError, match="question 4"):
+        scorer.to_matrix([[0, 0, 0, 1], [0, 0, 0, 0]])
+    matrix = scorer.to_matrix([[0, 0, 0, 1]])
+    assert matrix.dtype == np.int8
+
+
+def _profile(name: str) -> dict:
+    return {"name": name, "description": name, "strengths": name, "color": "#000000"}
+
+
+def _letters(*values: str) -> list:
+    return [{"text": value, "value": value} for value in values]
+
+
+# A/B over two questions (so it can tie) and C/D over three, interleaved; q3 lists its poles backwards
+TYPOLOGY = {
+    "id": "synthetic",
+    "name": "Synthetic Typology",
+    "description": "Test instrument",
+    "questions": [
+        {"id": 1, "text": "First A/B", "dimension": "A/B", "options": _letters("A", "B")},
+        {"id": 2, "text": "First C/D", "dimension": "C/D", "options": _letters("C", "D")},
+        {"id": 3, "text": "Second A/B", "dimension": "A/B", "options": _letters("B", "A")},
+        {"id": 4, "text": "Second C/D", "dimension": "C/D", "options": _letters("C", "D")},
+        {"id": 5, "text": "Third C/D", "dimension": "C/D", "options": _letters("C", "D")},
+    ],
+    "types": {name: _profile(name) for name in ("AC", "AD", "BC", "BD")},
+}
+
+
+def test_typology_compiles_poles_in_question_order():
+    scorer = _scorer(TYPOLOGY)
+    assert scorer.dimensions == ("A/B", "C/D")
+    assert scorer.poles == (("A", "B"), ("C", "D"))
+    assert scorer.questions_per_dimension == (2, 3)
+    # The pole comes from the dimension, not from the order the options are listed in
+    assert scorer.letter_map[2] == {"B": (0, 1), "A": (0, 0)}
+
+
+def test_typology_ties_go_to_the_first_pole():
+    scorer = _scorer(TYPOLOGY)
+    result = scorer.score(["A", "C", "B", "D", "D"])
+    assert result["type"] == "AD"
+    assert result["dimensions"]["A/B"] == {"A": 50.0, "B": 50.0}
+    assert result["profile"] == _profile("AD")
+    assert scorer.score(["B", "C", "A", "D", "D"])["type"] == "AD"
+
+
+def test_typology_percentages_are_per_dimension():
+    scorer = _scorer(TYPOLOGY)
+    result = scorer.score(["B", "D", "B", "C", "C"])
+    assert result == {
+        "assessment_id": "synthetic",
+        "type": "BC",
+        "dimensions": {"A/B": {"A": 0.0, "B": 100.0}, "C/D": {"C": 66.7, "D": 33.3}},
+        "profile": _profile("BC"),
+    }
+
+
+def test_typology_answers_must_be_options_of_their_question():
+    scorer = _scorer(TYPOLOGY)
+    with pytest.raises(ScoringError, match="Expected 5 answers"):
+        scorer.score(["A", "C", "A", "C"])
+    # "C" is a letter of the instrument, but not of question 1
+    with pytest.raises(ScoringError, match="question 1"):
+        scorer.score(["C", "C", "A", "C", "C"])
+    with pytest.raises(ScoringError, match="question 2"):
+        scorer.to_matrix([["A", "C", "A", "C", "C"], ["A", "a", "A", "C", "C"]])
+    with pytest.raises(ScoringError, match="must be a letter"):
+        scorer.to_matrix([[0, 1, 0, 1, 1]])
+
+
+def test_typology_batch_matches_single_scores():
+    scorer = _scorer(TYPOLOGY)
+    poles = [question["dimension"].split("/") for question in TYPOLOGY["questions"]]
+    rows = [list(answers) for answers in itertools.product(*poles)]
+    batch = scorer.score_matrix(scorer.to_matrix(rows))
+    singles = [scorer.score(row) for row in rows]
+
+    assert batch["count"] == len(rows) == 32
+    assert batch["dimensions"] == scorer.dimensions
+    assert batch["types"] == [single["type"] for single in singles]
+    assert batch["percentages"] == [
+        [single["dimensions"][dimension][dimension[0]] for dimension in scorer.dimensions] for single in singles
+    ]
+    assert batch["profiles"] == {single["type"]: single["profile"] for single in singles}
+
+
+@pytest.mark.parametrize(
+    "change, message",
+    [
+        (lambda detail: detail["questions"][0]["options"][1].update(value="C"), "not a pole of A/B"),
+        (lambda detail: detail["types"].pop("BD"), r"no types entry for \['BD'\]"),
+    ],
+    ids=["foreign letter", "missing type"],
+)
+def test_typology_compile_checks_letters_and_types(change, message):
+    detail = copy.deepcopy(TYPOLOGY)
+    change(detail)
+    with pytest.raises(ValueError, match=message):
+        _scorer(detail)